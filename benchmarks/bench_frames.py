@@ -0,0 +1,97 @@
+"""Micro-benchmark of the frame codec in api_utils.
+
+Compares the synchronous codec against the previous coroutine based
+implementation. Only api_utils is loaded, so Home Assistant and bleak are
+not needed:
+
+    python benchmarks/bench_frames.py
+"""
+import asyncio
+import importlib.util
+import pathlib
+import sys
+import timeit
+
+API_UTILS = pathlib.Path(__file__).resolve().parents[1] / "custom_components" / "govee_light_ble" / "api_utils.py"
+
+spec = importlib.util.spec_from_file_location("govee_api_utils", API_UTILS)
+api_utils = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = api_utils
+spec.loader.exec_module(api_utils)
+
+LedPacket = api_utils.LedPacket
+LedPacketHead = api_utils.LedPacketHead
+LedPacketCmd = api_utils.LedPacketCmd
+LedColorType = api_utils.LedColorType
+GoveeUtils = api_utils.GoveeUtils
+
+
+class LegacyUtils:
+    """The coroutine based codec the integration used before."""
+
+    @staticmethod
+    async def generateChecksum(frame: bytes):
+        checksum = 0
+        for b in frame:
+            checksum ^= b
+        return bytes([checksum & 0xFF])
+
+    @staticmethod
+    async def generateFrame(packet):
+        cmd = packet.cmd & 0xFF
+        frame = bytes([packet.head, cmd]) + bytes(packet.payload)
+        frame += bytes([0] * (19 - len(frame)))
+        frame += await LegacyUtils.generateChecksum(frame)
+        return frame
+
+    @staticmethod
+    async def verifyChecksum(frame: bytes):
+        checksum_received = frame[-1].to_bytes(1, 'big')
+        checksum_calculated = await LegacyUtils.generateChecksum(frame[:-1])
+        return checksum_received == checksum_calculated
+
+
+QUERY = LedPacket(LedPacketHead.REQUEST, LedPacketCmd.POWER)
+COLOR = LedPacket(LedPacketHead.COMMAND, LedPacketCmd.COLOR, [LedColorType.SEGMENTS, 0x01, 255, 128, 0, 0, 0, 0, 0, 0, 0xff, 0xff])
+NUMBER = 200_000
+
+
+def _rate(seconds: float) -> float:
+    return NUMBER / seconds
+
+
+def main():
+    loop = asyncio.new_event_loop()
+
+    async def legacy_frames(packet):
+        for _ in range(NUMBER):
+            await LegacyUtils.generateFrame(packet)
+
+    async def legacy_verify(frame):
+        for _ in range(NUMBER):
+            await LegacyUtils.verifyChecksum(frame)
+
+    buffer = bytearray(api_utils.FRAME_LENGTH)
+    frame = GoveeUtils.generateFrame(COLOR)
+    assert loop.run_until_complete(LegacyUtils.generateFrame(COLOR)) == frame
+    assert loop.run_until_complete(LegacyUtils.generateFrame(QUERY)) == GoveeUtils.generateFrame(QUERY)
+
+    results = [
+        ("query frame", lambda: loop.run_until_complete(legacy_frames(QUERY)), lambda: GoveeUtils.generateFrame(QUERY)),
+        ("color frame", lambda: loop.run_until_complete(legacy_frames(COLOR)), lambda: GoveeUtils.generateFrame(COLOR)),
+        ("color frame, reused buffer", None, lambda: GoveeUtils.writeFrame(buffer, COLOR.head, COLOR.cmd, COLOR.payload)),
+        ("verify checksum", lambda: loop.run_until_complete(legacy_verify(frame)), lambda: GoveeUtils.verifyChecksum(frame)),
+    ]
+
+    print(f"{'operation':<28}{'before/s':>14}{'after/s':>14}{'speedup':>10}")
+    for name, before, after in results:
+        before_rate = _rate(timeit.timeit(before, number=1)) if before else None
+        after_rate = _rate(timeit.timeit(after, number=NUMBER))
+        before_text = f"{before_rate:>14,.0f}" if before_rate else f"{'-':>14}"
+        speedup = f"{after_rate / before_rate:>9.1f}x" if before_rate else f"{'-':>10}"
+        print(f"{name:<28}{before_text}{after_rate:>14,.0f}{speedup}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
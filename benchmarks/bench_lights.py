@@ -0,0 +1,159 @@
+"""End to end benchmark of GoveeAPI and GoveeCoordinator against simulated lights.
+
+Every light performs a number of user actions (power, brightness and color
+in one burst) concurrently with all others. Reports commands per second,
+p50/p99 latency per action, connection churn (connects and disconnects)
+and radio writes per action:
+
+    python benchmarks/bench_lights.py --lights 1 10 100 --loss 0.02
+    python benchmarks/bench_lights.py --through coordinator --policy per_burst
+
+GoveeAPI needs bleak and bleak-retry-connector, the coordinator runs
+additionally need Home Assistant.
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from simulator import SimulatedAdapter, SimulatedFleet, const, load
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))] if ordered else 0.0
+
+
+async def _user_actions(target, actions: int, rng: random.Random) -> list[tuple[float, bool]]:
+    """ performs the actions of one light, returns latency and success of each """
+    results = []
+    for _ in range(actions):
+        started = time.monotonic()
+        await target.setStateBuffered(True)
+        await target.setBrightnessBuffered(rng.randrange(1, 256))
+        await target.setColorBuffered(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        try:
+            success = await target.sendPacketBuffer()
+        except Exception:
+            success = False
+        results.append((time.monotonic() - started, success))
+    return results
+
+
+async def _run_api(fleet: SimulatedFleet, args, rng: random.Random):
+    api = load("api")
+    scheduler = load("scheduler").GoveeConnectionScheduler(args.scheduler_slots)
+    targets = [
+        api.GoveeAPI(ble_device, _noop, True, connection_policy=args.policy, scheduler=scheduler)
+        for ble_device in fleet.ble_devices.values()
+    ]
+    with mock.patch.object(api, "establish_connection", fleet.establish_connection):
+        started = time.monotonic()
+        results = await asyncio.gather(*(_user_actions(target, args.actions, rng) for target in targets))
+        elapsed = time.monotonic() - started
+        for target in targets:
+            await target.reset_connection_state()
+    return results, elapsed
+
+
+async def _run_coordinator(fleet: SimulatedFleet, args, rng: random.Random):
+    from homeassistant.core import HomeAssistant
+
+    coordinator_module = load("coordinator")
+    api = load("api")
+    scheduler = load("scheduler").GoveeConnectionScheduler(args.scheduler_slots)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        targets = []
+        with mock.patch.object(api, "establish_connection", fleet.establish_connection):
+            for address, ble_device in fleet.ble_devices.items():
+                config_entry = SimpleNamespace(
+                    data={"name": ble_device.name, "address": address, "segmented": True},
+                    options={const.CONF_CONNECTION_POLICY: args.policy},
+                    unique_id=address,
+                    async_on_unload=lambda unsub: None
+                )
+                targets.append(coordinator_module.GoveeCoordinator(hass, config_entry, ble_device, scheduler))
+            await asyncio.gather(*(target.async_refresh() for target in targets))
+
+            started = time.monotonic()
+            results = await asyncio.gather(*(_user_actions(target, args.actions, rng) for target in targets))
+            elapsed = time.monotonic() - started
+            for target in targets:
+                await target.async_shutdown()
+                await target.reset_connection()
+    return results, elapsed
+
+
+async def _noop():
+    pass
+
+
+async def bench(lights: int, args) -> dict:
+    adapters = [
+        SimulatedAdapter(
+            f"proxy{index}",
+            slots=args.adapter_slots,
+            connect_latency=args.connect_latency,
+            write_latency=args.write_latency,
+            notify_latency=args.latency,
+            loss=args.loss,
+            seed=args.seed + index
+        )
+        for index in range(args.adapters)
+    ]
+    fleet = SimulatedFleet(lights, adapters)
+    rng = random.Random(args.seed)
+    runner = _run_coordinator if args.through == "coordinator" else _run_api
+    results, elapsed = await runner(fleet, args, rng)
+
+    actions = [result for light in results for result in light]
+    latencies = [latency for latency, _ in actions]
+    return {
+        "lights": lights,
+        "commands_per_second": len(actions) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "confirmed": sum(success for _, success in actions) / len(actions) if actions else 0.0,
+        "connects": fleet.connects,
+        "disconnects": fleet.disconnects,
+        "slot_errors": fleet.slot_errors,
+        "writes_per_action": fleet.writes / len(actions) if actions else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lights", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--actions", type=int, default=10, help="user actions per light")
+    parser.add_argument("--through", choices=["api", "coordinator"], default="api")
+    parser.add_argument("--policy", choices=const.CONNECTION_POLICIES, default=const.DEFAULT_CONNECTION_POLICY)
+    parser.add_argument("--adapters", type=int, default=1)
+    parser.add_argument("--adapter-slots", type=int, default=const.MAX_CONNECTIONS_PER_ADAPTER, help="connections an adapter accepts")
+    parser.add_argument("--scheduler-slots", type=int, default=const.MAX_CONNECTIONS_PER_ADAPTER, help="connections the integration opens per adapter")
+    parser.add_argument("--connect-latency", type=float, default=0.2)
+    parser.add_argument("--write-latency", type=float, default=0.005)
+    parser.add_argument("--latency", type=float, default=0.01, help="notification latency")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability a frame is lost in either direction")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(
+        f"{'lights':>6} {'cmd/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'confirmed':>9} "
+        f"{'connects':>8} {'disconn':>8} {'slot err':>8} {'writes/act':>10}"
+    )
+    for lights in args.lights:
+        result = asyncio.run(bench(lights, args))
+        print(
+            f"{result['lights']:>6} {result['commands_per_second']:>8.1f} "
+            f"{result['p50'] * 1000:>8.1f} {result['p99'] * 1000:>8.1f} "
+            f"{result['confirmed']:>9.1%} {result['connects']:>8} {result['disconnects']:>8} {result['slot_errors']:>8} "
+            f"{result['writes_per_action']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Simulated Govee lights and BLE adapters for offline benchmarks.
+
+The simulated device speaks the 20 byte protocol: 0x33 commands change its
+state and are echoed back, 0xaa requests are answered with the current
+state. Adapters limit the number of concurrent connections like a local
+controller or an ESPHome proxy would. Latency and packet loss are
+configurable per adapter.
+
+The integration package is loaded without its __init__ module, so
+GoveeAPI only needs bleak and bleak-retry-connector, GoveeCoordinator
+additionally needs Home Assistant.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import pathlib
+import random
+import sys
+import types
+from dataclasses import dataclass, field
+
+INTEGRATION = pathlib.Path(__file__).resolve().parents[1] / "custom_components" / "govee_light_ble"
+PACKAGE = "govee_light_ble_bench"
+
+
+def load(module: str):
+    """Imports a module of the integration without running its package __init__."""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(INTEGRATION)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+api_utils = load("api_utils")
+const = load("const")
+GoveeUtils = api_utils.GoveeUtils
+LedPacket = api_utils.LedPacket
+LedPacketHead = api_utils.LedPacketHead
+LedPacketCmd = api_utils.LedPacketCmd
+LedColorType = api_utils.LedColorType
+
+
+class SimulatedGoveeDevice:
+    """State machine of one light, answers frames like the firmware does."""
+
+    def __init__(self, address: str, segmented: bool = True):
+        self.address = address
+        self.segmented = segmented
+        self.state = False
+        self.brightness = 100 if segmented else 255
+        self.color = (255, 255, 255)
+        self.segments = [self.color] * const.SEGMENT_COUNT
+        self.mode = 0x00
+        self.frames_received = 0
+
+    def handle(self, frame: bytes) -> list[bytes]:
+        """ applies a frame, returns the frames the device notifies in response """
+        self.frames_received += 1
+        if len(frame) != api_utils.FRAME_LENGTH or not GoveeUtils.verifyChecksum(frame):
+            return []
+        head, cmd, payload = frame[0], frame[1], frame[2:-1]
+        if head == LedPacketHead.COMMAND:
+            self._apply(cmd, payload)
+            #commands are echoed unchanged
+            return [bytes(frame)]
+        if head == LedPacketHead.REQUEST:
+            return [GoveeUtils.generateFrame(LedPacket(LedPacketHead.REQUEST, cmd, self._report(cmd, payload)))]
+        return []
+
+    def _apply(self, cmd: int, payload: bytes):
+        if cmd == LedPacketCmd.POWER:
+            self.state = payload[0] == 0x01
+        elif cmd == LedPacketCmd.BRIGHTNESS:
+            self.brightness = payload[0]
+        elif cmd == LedPacketCmd.COLOR:
+            self.mode = 0x00
+            if payload[0] == LedColorType.SEGMENTS:
+                color = (payload[2], payload[3], payload[4])
+                mask = payload[10] | payload[11] << 8
+                for index in range(const.SEGMENT_COUNT):
+                    if mask & (1 << index):
+                        self.segments[index] = color
+                self.color = self.segments[0]
+            else:
+                self.color = (payload[1], payload[2], payload[3])
+                self.segments = [self.color] * const.SEGMENT_COUNT
+        elif cmd in (LedPacketCmd.MUSIC_MODE, LedPacketCmd.EFFECT, LedPacketCmd.SCENE):
+            self.mode = payload[0]
+
+    def _report(self, cmd: int, payload: bytes) -> bytes:
+        if cmd == LedPacketCmd.POWER:
+            return bytes([0x01 if self.state else 0x00])
+        if cmd == LedPacketCmd.BRIGHTNESS:
+            return bytes([self.brightness])
+        if cmd == LedPacketCmd.COLOR:
+            return bytes([LedColorType.SINGLE, *self.color])
+        if cmd == LedPacketCmd.SEGMENT:
+            group = payload[0]
+            report = bytearray([group])
+            for index in range(const.SEGMENTS_PER_GROUP):
+                segment = (group - 1) * const.SEGMENTS_PER_GROUP + index
+                color = self.segments[segment] if 0 <= segment < const.SEGMENT_COUNT else (0, 0, 0)
+                report += bytes([self.brightness, *color])
+            return bytes(report)
+        return bytes([self.mode])
+
+
+@dataclass
+class SimulatedAdapter:
+    """A local adapter or proxy with limited connection slots."""
+
+    name: str
+    slots: int = 3
+    connect_latency: float = 0.2
+    write_latency: float = 0.005
+    notify_latency: float = 0.01
+    loss: float = 0.0
+    seed: int | None = None
+    active: int = 0
+    connects: int = 0
+    disconnects: int = 0
+    slot_errors: int = 0
+    writes: int = 0
+    lost: int = 0
+    _random: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    def dropped(self) -> bool:
+        """ decides whether the next packet is lost on air """
+        if self.loss and self._random.random() < self.loss:
+            self.lost += 1
+            return True
+        return False
+
+
+@dataclass
+class SimulatedBLEDevice:
+    """Stands in for bleak's BLEDevice, only the fields the integration reads."""
+
+    address: str
+    name: str
+    details: dict
+
+
+@dataclass(frozen=True)
+class SimulatedCharacteristic:
+    uuid: str
+
+
+class _Services:
+    def get_characteristic(self, uuid: str) -> SimulatedCharacteristic:
+        return SimulatedCharacteristic(uuid)
+
+
+class SimulatedBleakClient:
+    """Client connected to a simulated device through a simulated adapter."""
+
+    def __init__(self, device: SimulatedGoveeDevice, adapter: SimulatedAdapter, disconnected_callback=None):
+        self.device = device
+        self.adapter = adapter
+        self.services = _Services()
+        self._disconnected_callback = disconnected_callback
+        self._notify_callback = None
+        self._connected = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def connect(self):
+        adapter = self.adapter
+        if adapter.active >= adapter.slots:
+            adapter.slot_errors += 1
+            from bleak_retry_connector import BleakOutOfConnectionSlotsError
+            raise BleakOutOfConnectionSlotsError(f"No free slot on {adapter.name}")
+        #the slot is taken while the link is set up
+        adapter.active += 1
+        try:
+            await asyncio.sleep(adapter.connect_latency)
+        except asyncio.CancelledError:
+            adapter.active -= 1
+            raise
+        adapter.connects += 1
+        self._connected = True
+
+    async def disconnect(self):
+        if self._connected:
+            self._connected = False
+            self.adapter.active -= 1
+            self.adapter.disconnects += 1
+            if self._disconnected_callback:
+                self._disconnected_callback(self)
+        return True
+
+    async def start_notify(self, characteristic, callback):
+        self._notify_callback = callback
+
+    async def stop_notify(self, characteristic):
+        self._notify_callback = None
+
+    async def clear_cache(self):
+        return True
+
+    async def write_gatt_char(self, characteristic, data, response: bool = False):
+        if not self._connected:
+            raise ConnectionError(f"{self.device.address} is not connected")
+        adapter = self.adapter
+        adapter.writes += 1
+        await asyncio.sleep(adapter.write_latency)
+        if adapter.dropped():
+            return
+        loop = asyncio.get_running_loop()
+        for response_frame in self.device.handle(bytes(data)):
+            if not adapter.dropped():
+                loop.call_later(adapter.notify_latency, self._notify, response_frame)
+
+    def _notify(self, frame: bytes):
+        callback = self._notify_callback
+        if not self._connected or callback is None:
+            return
+        result = callback(SimulatedCharacteristic(const.READ_CHARACTERISTIC_UUID), bytearray(frame))
+        if asyncio.iscoroutine(result):
+            #bleak runs coroutine callbacks as tasks as well
+            asyncio.get_running_loop().create_task(result)
+
+
+class SimulatedFleet:
+    """Lights spread round robin over adapters, replaces establish_connection."""
+
+    def __init__(self, lights: int, adapters: list[SimulatedAdapter], segmented: bool = True):
+        self.adapters = {adapter.name: adapter for adapter in adapters}
+        self.devices: dict[str, SimulatedGoveeDevice] = {}
+        self.ble_devices: dict[str, SimulatedBLEDevice] = {}
+        for index in range(lights):
+            address = f"A4:C1:38:00:{index >> 8:02X}:{index & 0xff:02X}"
+            adapter = adapters[index % len(adapters)]
+            self.devices[address] = SimulatedGoveeDevice(address, segmented)
+            self.ble_devices[address] = SimulatedBLEDevice(address, f"Govee_{index}", {"source": adapter.name})
+
+    async def establish_connection(self, client_class, ble_device, name, disconnected_callback=None, max_attempts: int = 3, **kwargs):
+        """ drop in for bleak_retry_connector.establish_connection """
+        adapter = self.adapters[ble_device.details["source"]]
+        client = SimulatedBleakClient(self.devices[ble_device.address], adapter, disconnected_callback)
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await client.connect()
+                return client
+            except Exception:
+                if attempt == max_attempts:
+                    raise
+                #bleak-retry-connector backs off between attempts as well
+                await asyncio.sleep(0.25 * attempt)
+
+    @property
+    def writes(self) -> int:
+        return sum(adapter.writes for adapter in self.adapters.values())
+
+    @property
+    def connects(self) -> int:
+        return sum(adapter.connects for adapter in self.adapters.values())
+
+    @property
+    def disconnects(self) -> int:
+        return sum(adapter.disconnects for adapter in self.adapters.values())
+
+    @property
+    def slot_errors(self) -> int:
+        return sum(adapter.slot_errors for adapter in self.adapters.values())
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from typing import Callable
 from enum import IntEnum
 from dataclasses import dataclass
@@ -8,16 +9,61 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.const import CONF_ADDRESS
+from homeassistant.const import CONF_ADDRESS, CONF_NAME
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers import config_validation as cv
+from homeassistant.components.light import ATTR_BRIGHTNESS, ATTR_RGB_COLOR
+import voluptuous as vol
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .coordinator import GoveeCoordinator
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    DATA_SCHEDULER,
+    DATA_EFFECTS,
+    DATA_STORE,
+    DATA_STARTUP_QUEUE,
+    STARTUP_POLL_DELAY,
+    STARTUP_POLL_STAGGER,
+    CONF_EFFECTS,
+    CONF_KEYFRAMES,
+    CONF_LOOP,
+    CONF_TIME,
+    CONF_EASING
+)
+from .api_utils import EFFECT_MAP
+from .sequencer import EASINGS, EffectDefinition, Keyframe
+from .storage import GoveeStateStore
+from .scheduler import GoveeConnectionScheduler
+from .services import async_setup_services
 
 import logging
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.LIGHT]
+PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.SENSOR]
+
+KEYFRAME_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required(CONF_TIME): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional(ATTR_RGB_COLOR): vol.All(vol.ExactSequence((cv.byte, cv.byte, cv.byte)), vol.Coerce(tuple)),
+        vol.Optional(CONF_EASING, default="linear"): vol.In(EASINGS),
+    }),
+    cv.has_at_least_one_key(ATTR_BRIGHTNESS, ATTR_RGB_COLOR)
+)
+
+EFFECT_SCHEMA = vol.Schema({
+    # Built-in effect names stay reserved for the device modes
+    vol.Required(CONF_NAME): vol.All(cv.string, vol.NotIn(EFFECT_MAP, msg="name of a built-in effect")),
+    vol.Optional(CONF_LOOP, default=False): cv.boolean,
+    vol.Required(CONF_KEYFRAMES): vol.All(cv.ensure_list, vol.Length(min=1), [KEYFRAME_SCHEMA]),
+})
+
+CONFIG_SCHEMA = vol.Schema({
+    DOMAIN: vol.Schema({
+        vol.Optional(CONF_EFFECTS, default=[]): vol.All(cv.ensure_list, [EFFECT_SCHEMA]),
+    })
+}, extra=vol.ALLOW_EXTRA)
 
 @dataclass
 class RuntimeData:
@@ -26,10 +72,39 @@ class RuntimeData:
     coordinator: GoveeCoordinator
     cancel_update_listener: Callable
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration wide services and the effects configured in YAML."""
+    effects = {}
+    for effect in config.get(DOMAIN, {}).get(CONF_EFFECTS, []):
+        keyframes = sorted(
+            (
+                Keyframe(
+                    keyframe[CONF_TIME],
+                    keyframe.get(ATTR_BRIGHTNESS),
+                    keyframe.get(ATTR_RGB_COLOR),
+                    keyframe[CONF_EASING]
+                )
+                for keyframe in effect[CONF_KEYFRAMES]
+            ),
+            key=lambda keyframe: keyframe.time
+        )
+        effects[effect[CONF_NAME]] = EffectDefinition(effect[CONF_NAME], tuple(keyframes), effect[CONF_LOOP])
+    hass.data.setdefault(DOMAIN, {})[DATA_EFFECTS] = effects
+
+    # Last known states let entries load without connecting to the lights
+    store = GoveeStateStore(hass)
+    await store.async_load()
+    hass.data[DOMAIN][DATA_STORE] = store
+
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up Integration from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
+    # One scheduler shares the adapter and proxy connection slots between all lights
+    scheduler = hass.data[DOMAIN].setdefault(DATA_SCHEDULER, GoveeConnectionScheduler())
 
     # Look for device
     device_address = config_entry.data[CONF_ADDRESS]
@@ -45,18 +120,34 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
 
     # Initialise the coordinator that manages data updates from your api.
     # This is defined in coordinator.py
+    started = time.monotonic()
     try:
-        coordinator = GoveeCoordinator(hass, config_entry)
+        coordinator = GoveeCoordinator(hass, config_entry, ble_device, scheduler)
     except Exception as e:
         _LOGGER.error(f"Failed to initialize coordinator for {device_address}: {e}")
         raise ConfigEntryNotReady(f"Failed to initialize coordinator: {e}")
 
-    # Perform an initial data load from api.
-    # async_config_entry_first_refresh() is special in that it does not log errors if it fails
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as e:
-        _LOGGER.warning(f"Initial refresh failed for {device_address}, will continue anyway: {e}")
+    store: GoveeStateStore = hass.data[DOMAIN][DATA_STORE]
+    cached = store.get(device_address)
+    if cached is not None:
+        # Show the persisted state now and poll later, one light after another
+        now = time.monotonic()
+        first_poll = max(now + STARTUP_POLL_DELAY, hass.data[DOMAIN].get(DATA_STARTUP_QUEUE, 0) + STARTUP_POLL_STAGGER)
+        hass.data[DOMAIN][DATA_STARTUP_QUEUE] = first_poll
+        coordinator.restore_cached(cached, first_poll - now)
+        _LOGGER.debug(f"Restored {device_address} from storage in {time.monotonic() - started:.3f}s, first poll in {first_poll - now:.0f}s")
+    else:
+        # Perform an initial data load from api.
+        # async_config_entry_first_refresh() is special in that it does not log errors if it fails
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception as e:
+            _LOGGER.warning(f"Initial refresh failed for {device_address}, will continue anyway: {e}")
+
+    # Persist every published state for the next start
+    config_entry.async_on_unload(
+        coordinator.async_add_listener(lambda: store.async_update(device_address, coordinator.data))
+    )
 
     # Initialise a listener for config flow options changes.
     # See config_flow for defining an options setting that shows up as configure on the integration.
@@ -96,6 +187,7 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         # Disconnect from the device
         try:
             coordinator = runtime_data.coordinator
+            await coordinator.async_shutdown()
             await coordinator.reset_connection()
             _LOGGER.debug(f"Successfully disconnected from {coordinator.device_address}")
         except Exception as e:
@@ -113,6 +205,12 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     # Return that unloading was successful.
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Forget the persisted state of a removed light."""
+    store: GoveeStateStore | None = hass.data.get(DOMAIN, {}).get(DATA_STORE)
+    if store:
+        store.async_remove(config_entry.data[CONF_ADDRESS])
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     """Migrate old entry."""
     _LOGGER.debug("Migrating configuration from version %s", config_entry.version)
@@ -1,138 +1,375 @@
 import asyncio
+import math
 import time
-import bleak_retry_connector
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from bleak.backends.characteristic import BleakGATTCharacteristic
-from bleak import (
-    BleakClient,
-    BLEDevice
+from bleak import BLEDevice
+from bleak_retry_connector import (
+    BleakClientWithServiceCache,
+    BleakOutOfConnectionSlotsError,
+    establish_connection
 )
-from bleak_retry_connector import BleakOutOfConnectionSlotsError
 from .const import (
     WRITE_CHARACTERISTIC_UUID, 
     READ_CHARACTERISTIC_UUID,
     MAX_CONNECTION_ATTEMPTS,
-    CONNECTION_TIMEOUT,
-    RETRY_DELAY,
-    INITIAL_CONNECTION_TIMEOUT,
-    RECONNECTION_TIMEOUT
+    PACKET_RETRY_LIMIT,
+    COMMAND_RETRY_LIMIT,
+    COMMAND_RETRY_DELAY,
+    PACKET_DELAY_MIN,
+    PACKET_DELAY_MAX,
+    PACKET_PACING_FACTOR,
+    ACK_TIMEOUT,
+    SNAPSHOT_TIMEOUT,
+    TRANSITION_MIN_FRAME_INTERVAL,
+    SEGMENT_COUNT,
+    SEGMENTS_PER_GROUP,
+    SEGMENT_GROUPS,
+    DUPLICATE_WINDOW,
+    CONNECTION_POLICY_ALWAYS,
+    CONNECTION_POLICY_IDLE,
+    CONNECTION_POLICY_BURST,
+    DEFAULT_CONNECTION_POLICY,
+    DEFAULT_IDLE_TIMEOUT,
+    KEEP_ALIVE_INTERVAL,
+    OPTIMISTIC_TIMEOUT
 )
 from .api_utils import (
     LedPacketHead,
     LedPacketCmd,
     LedColorType,
     LedPacket,
+    GoveeApiData,
     GoveeUtils,
+    FRAME_LENGTH,
     MusicModeType,
-    CarnivalModeType,
-    BasicModeType,
     EFFECT_MAP
 )
+from .stream import FrameRingBuffer
+from .metrics import DeviceMetrics
+from .breaker import CircuitBreaker, CircuitOpenError
+from .paths import PathCandidate, PathSelector
+from .sequencer import CompiledEffect, EffectDefinition, compileEffect
+from .scheduler import (
+    GoveeConnectionScheduler,
+    PriorityGate,
+    SlotTimeoutError,
+    PRIORITY_USER,
+    PRIORITY_POLL
+)
 
 import logging
 _LOGGER = logging.getLogger(__name__)
 
-class GoveeAPI:
-    state: bool | None = None
-    brightness: int | None = None
-    color: tuple[int, ...] | None = None
-    current_effect: str | None = None
-    music_mode_enabled: bool = False
+#resolved (read, write) characteristics per address, reused across reconnects
+_CHARACTERISTIC_CACHE: dict[str, tuple[BleakGATTCharacteristic, BleakGATTCharacteristic]] = {}
+
+@dataclass
+class ConnectionStats:
+    """Connection reuse statistics of a single device."""
+
+    connects: int = 0
+    reuses: int = 0
+    connect_time_total: float = 0.0
+    keep_alives: int = 0
+    idle_disconnects: int = 0
 
-    def __init__(self, ble_device: BLEDevice, update_callback, segmented: bool = False):
-        self._conn = None
+    @property
+    def average_connect_time(self) -> float:
+        """Average time spent setting up a connection."""
+        return self.connect_time_total / self.connects if self.connects else 0.0
+
+    @property
+    def setup_time_saved(self) -> float:
+        """Connection setup time avoided by reusing an open connection."""
+        return self.reuses * self.average_connect_time
+
+
+class GoveeConnectionManager:
+    """Owns the BLE connection of one device and decides when to keep or release it."""
+
+    def __init__(
+        self,
+        ble_device: BLEDevice,
+        notify_callback,
+        policy: str = DEFAULT_CONNECTION_POLICY,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        keep_alive_callback=None,
+        disconnected_callback=None,
+        path_resolver: Callable[[], list[PathCandidate]] | None = None,
+        scheduler: GoveeConnectionScheduler | None = None,
+    ):
         self._ble_device = ble_device
-        self._segmented = segmented
-        self._packet_buffer = []
+        self._notify_callback = notify_callback
+        self._keep_alive_callback = keep_alive_callback
+        self._disconnected_callback = disconnected_callback
+        self.policy = policy
+        self.idle_timeout = idle_timeout
+        self.stats = ConnectionStats()
+        self.metrics = DeviceMetrics()
         self._client = None
-        self._update_callback = update_callback
         self._connection_lock = asyncio.Lock()
-        self._last_connection_attempt = 0
-        self._connection_failures = 0
+        self.breaker = CircuitBreaker(ble_device.address)
+        #offers the current ways to reach the device, see select_path
+        self._path_resolver = path_resolver
+        self.paths = PathSelector()
+        #adapter slots are held from connecting until the link is gone
+        self._scheduler = scheduler
+        self._slot_source: str | None = None
+        self._last_activity = 0.0
+        self._idle_timer: asyncio.TimerHandle | None = None
+        self._keep_alive_task: asyncio.Task | None = None
+        self._release_task: asyncio.Task | None = None
 
     @property
     def address(self):
         return self._ble_device.address
 
-    async def _ensureConnected(self):
-        """Ensures a connection to the bluetooth device with proper locking."""
+    @property
+    def source(self) -> str:
+        """The adapter or proxy this device is reached through."""
+        return GoveeConnectionScheduler.source_of(self._ble_device)
+
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def is_connected(self):
+        """Check if the device is currently connected."""
+        return bool(self._client and self._client.is_connected)
+
+    @property
+    def connection_failures(self):
+        """Get the current number of connection failures."""
+        return self.breaker.failures
+
+    def select_path(self):
+        """Switches to the most promising adapter or proxy before connecting."""
+        if self._path_resolver is None or self.is_connected:
+            return
+        try:
+            candidates = self._path_resolver()
+        except Exception as e:
+            _LOGGER.debug(f"Could not resolve connection paths of {self.address}: {e}")
+            return
+        best = self.paths.choose(candidates, self.source)
+        if best is None:
+            return
+        if best.source != self.source:
+            _LOGGER.debug(f"Connecting {self.address} through {best.source} (rssi {best.rssi}) instead of {self.source}")
+            #characteristics belong to the backend of the previous path
+            _CHARACTERISTIC_CACHE.pop(self.address, None)
+        self._ble_device = best.ble_device
+
+    def check_circuit(self):
+        """Fails fast while the device is known to be unreachable."""
+        if self.breaker.rejecting:
+            retry_in = self.breaker.retry_in
+            self.metrics.backoff_time.observe(retry_in)
+            raise CircuitOpenError(self.address, retry_in)
+
+    async def ensure_connected(self, priority: int = PRIORITY_USER):
+        """Ensures a connection to the bluetooth device with proper locking.
+
+        A new connection first waits for a slot of its adapter, user traffic
+        ahead of polls.
+        """
+        if not self.is_connected:
+            # Refuse before waiting for the lock
+            self.check_circuit()
+        self._cancel_idle_timer()
+        self._last_activity = time.monotonic()
+        if self._slot_source is not None:
+            #busy again, the slot can no longer be taken away
+            self._scheduler.mark_busy(self._slot_source, self)
         async with self._connection_lock:
-            if self._client and self._client.is_connected:
-                return
-            await self._connect()
-    
+            if self.is_connected:
+                self.stats.reuses += 1
+                return self._client
+            source = self.source
+            try:
+                await self._take_slot(priority)
+                started = time.monotonic()
+                await self._connect()
+            except BaseException as e:
+                self._return_slot()
+                if isinstance(e, Exception) and not isinstance(e, CircuitOpenError):
+                    self.paths.record(source, False)
+                raise
+            connect_time = time.monotonic() - started
+            self.paths.record(source, True, connect_time)
+            self.stats.connects += 1
+            self.stats.connect_time_total += connect_time
+            self.metrics.connect_time.observe(connect_time)
+            return self._client
+
+    async def _take_slot(self, priority: int):
+        """ waits for a connection slot of the adapter the device is reached through """
+        if self._scheduler is None or self._slot_source is not None:
+            return
+        source = self.source
+        await self._scheduler.acquire(source, priority)
+        self._slot_source = source
+
+    def _return_slot(self):
+        """ gives the adapter slot back once no connection uses it """
+        source, self._slot_source = self._slot_source, None
+        if source is not None:
+            self._scheduler.mark_busy(source, self)
+            self._scheduler.release(source)
+
+    def release(self, contended: bool = False):
+        """Called after a burst of traffic, applies the connection policy.
+
+        A contended slot (other lights waiting for the same adapter) is given
+        back right away unless the policy keeps the connection open. An idle
+        link keeps its slot but hands it over when another light asks for it.
+        """
+        self._last_activity = time.monotonic()
+        if not self.is_connected:
+            return
+        if self._slot_source is not None and self.policy != CONNECTION_POLICY_ALWAYS:
+            self._scheduler.mark_idle(self._slot_source, self, self._evict)
+        if self.policy == CONNECTION_POLICY_BURST or (contended and self.policy != CONNECTION_POLICY_ALWAYS):
+            #give the slot back right away
+            self._schedule_release()
+        elif self.policy == CONNECTION_POLICY_IDLE:
+            self._cancel_idle_timer()
+            self._idle_timer = asyncio.get_running_loop().call_later(
+                self.idle_timeout, self._schedule_release
+            )
+        elif self.policy == CONNECTION_POLICY_ALWAYS:
+            if self._keep_alive_task is None or self._keep_alive_task.done():
+                self._keep_alive_task = asyncio.create_task(self._keep_alive_loop())
+
+    def _evict(self):
+        """Called by the scheduler when another light needs the slot of this idle link."""
+        self._cancel_idle_timer()
+        self._schedule_release()
+
+    def _schedule_release(self):
+        """Proactively disconnect to free the connection slot."""
+        self._idle_timer = None
+        if self._release_task is None or self._release_task.done():
+            self._release_task = asyncio.create_task(self._release_slot(time.monotonic()))
+
+    async def _release_slot(self, requested: float):
+        if self._last_activity > requested:
+            #new traffic started, the next release() decides again
+            return
+        if self.is_connected:
+            self.stats.idle_disconnects += 1
+            _LOGGER.debug(f"Releasing connection slot of {self.address} ({self.policy})")
+            await self.disconnect()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    async def _keep_alive_loop(self):
+        """Keeps an otherwise idle connection open by pinging the device."""
+        while self.policy == CONNECTION_POLICY_ALWAYS:
+            await asyncio.sleep(KEEP_ALIVE_INTERVAL)
+            if time.monotonic() - self._last_activity < KEEP_ALIVE_INTERVAL:
+                continue
+            try:
+                self.stats.keep_alives += 1
+                await self._keep_alive_callback()
+            except Exception as e:
+                _LOGGER.debug(f"Keep-alive for {self.address} failed: {e}")
+
+    def _on_disconnected(self, client):
+        """Called by bleak when the link drops."""
+        _LOGGER.debug(f"Connection to {self.address} lost")
+        if client is self._client:
+            self._return_slot()
+        if self._disconnected_callback:
+            self._disconnected_callback()
+
     async def _connect(self):
-        """Connect to the BLE device with improved error handling and retry logic."""
-        current_time = time.time()
-        
-        # Implement exponential backoff for repeated failures
-        if self._connection_failures > 0:
-            backoff_delay = min(2 ** self._connection_failures, 30)  # Max 30 seconds
-            if current_time - self._last_connection_attempt < backoff_delay:
-                _LOGGER.debug(f"Skipping connection attempt for {self.address} due to backoff (failures: {self._connection_failures})")
-                raise Exception(f"Connection backoff active for {self.address}")
-        
-        self._last_connection_attempt = current_time
-        last_exception = None
+        """Connect to the BLE device, reusing cached GATT services and characteristics."""
+        if not self.breaker.allow():
+            self.check_circuit()
         
         # Clean up any existing connection first
         await self._cleanup_connection()
         
-        for attempt in range(MAX_CONNECTION_ATTEMPTS):
+        try:
+            # establish_connection retries transient errors and reuses the cached service table
+            self._client = await establish_connection(
+                BleakClientWithServiceCache,
+                self._ble_device,
+                self._ble_device.name or self.address,
+                disconnected_callback=self._on_disconnected,
+                max_attempts=MAX_CONNECTION_ATTEMPTS
+            )
+            read_char, _ = await self._resolve_characteristics()
+            # Start notifications
+            await self._client.start_notify(read_char, self._notify_callback)
+        except asyncio.CancelledError:
+            #not the device's fault, the next caller tries again
+            self.breaker.cancel_trial()
+            await self._cleanup_connection()
+            raise
+        except BleakOutOfConnectionSlotsError as e:
+            #a full adapter says nothing about the device, only the path statistics count it
+            self.breaker.cancel_trial()
+            _LOGGER.warning(f"No free connection slot on {self.source} for {self.address}: {e}")
+            await self._cleanup_connection()
+            raise
+        except Exception as e:
+            self.breaker.record_failure()
+            _LOGGER.warning(f"Failed to connect to {self.address} (failure count: {self.breaker.failures}): {type(e).__name__}: {e}")
+            # The cached services may be outdated, discover them again next time
+            await self._invalidate_characteristics()
+            await self._cleanup_connection()
+            raise
+        
+        # Reset failure counter on successful connection
+        self.breaker.record_success()
+        _LOGGER.debug(f"Successfully connected to {self.address}")
+
+    @property
+    def read_characteristic(self) -> BleakGATTCharacteristic | str:
+        """The resolved notify characteristic, or its UUID until resolved."""
+        cached = _CHARACTERISTIC_CACHE.get(self.address)
+        return cached[0] if cached else READ_CHARACTERISTIC_UUID
+
+    @property
+    def write_characteristic(self) -> BleakGATTCharacteristic | str:
+        """The resolved write characteristic, or its UUID until resolved."""
+        cached = _CHARACTERISTIC_CACHE.get(self.address)
+        return cached[1] if cached else WRITE_CHARACTERISTIC_UUID
+
+    async def _resolve_characteristics(self):
+        """Looks up the read/write characteristics once per address."""
+        cached = _CHARACTERISTIC_CACHE.get(self.address)
+        if cached:
+            return cached
+        read_char = self._client.services.get_characteristic(READ_CHARACTERISTIC_UUID)
+        write_char = self._client.services.get_characteristic(WRITE_CHARACTERISTIC_UUID)
+        if not read_char or not write_char:
+            raise Exception(f"Govee characteristics not found on {self.address}")
+        _CHARACTERISTIC_CACHE[self.address] = (read_char, write_char)
+        return read_char, write_char
+
+    async def _invalidate_characteristics(self):
+        """Drops the cached services and characteristics of this device."""
+        _CHARACTERISTIC_CACHE.pop(self.address, None)
+        if self._client:
             try:
-                _LOGGER.info(f"Connection attempt {attempt + 1}/{MAX_CONNECTION_ATTEMPTS} for {self.address}")
-                
-                # Determine timeout based on whether this is initial connection or reconnection
-                timeout = INITIAL_CONNECTION_TIMEOUT if self._connection_failures == 0 else RECONNECTION_TIMEOUT
-                
-                # Create a fresh BleakClient for each attempt
-                self._client = BleakClient(self._ble_device)
-                
-                # Connect with timeout
-                await asyncio.wait_for(
-                    self._client.connect(),
-                    timeout=timeout
-                )
-                
-                if not self._client.is_connected:
-                    raise Exception("Connection established but client reports not connected")
-                
-                # Start notifications
-                await self._client.start_notify(READ_CHARACTERISTIC_UUID, self._handleReceive)
-                
-                # Reset failure counter on successful connection
-                self._connection_failures = 0
-                _LOGGER.info(f"Successfully connected to {self.address} on attempt {attempt + 1}")
-                return
-                
-            except BleakOutOfConnectionSlotsError as e:
-                last_exception = e
-                _LOGGER.warning(f"Connection slot error for {self.address}, attempt {attempt + 1}: {e}")
-                await self._cleanup_connection()
-                if attempt < MAX_CONNECTION_ATTEMPTS - 1:
-                    await asyncio.sleep(RETRY_DELAY * (attempt + 1))  # Exponential backoff
-                    
-            except asyncio.TimeoutError as e:
-                last_exception = e
-                _LOGGER.warning(f"Connection timeout for {self.address}, attempt {attempt + 1} (timeout: {timeout}s)")
-                await self._cleanup_connection()
-                if attempt < MAX_CONNECTION_ATTEMPTS - 1:
-                    await asyncio.sleep(RETRY_DELAY)
-                    
+                await self._client.clear_cache()
             except Exception as e:
-                last_exception = e
-                _LOGGER.warning(f"Connection error for {self.address}, attempt {attempt + 1}: {type(e).__name__}: {e}")
-                await self._cleanup_connection()
-                if attempt < MAX_CONNECTION_ATTEMPTS - 1:
-                    await asyncio.sleep(RETRY_DELAY)
-        
-        # All attempts failed, increment failure counter
-        self._connection_failures += 1
-        error_msg = f"Failed to connect to {self.address} after {MAX_CONNECTION_ATTEMPTS} attempts (failure count: {self._connection_failures})"
-        _LOGGER.error(error_msg)
-        raise last_exception or Exception(error_msg)
+                _LOGGER.debug(f"Error clearing service cache for {self.address}: {e}")
     
     async def _cleanup_connection(self):
         """Clean up any existing connection state."""
+        if self._disconnected_callback:
+            self._disconnected_callback()
         if self._client:
             try:
                 if self._client.is_connected:
@@ -142,121 +379,623 @@ class GoveeAPI:
             finally:
                 self._client = None
     
-    async def _disconnect(self):
+    async def disconnect(self):
         """Properly disconnect from the BLE device."""
         async with self._connection_lock:
+            if self._disconnected_callback:
+                self._disconnected_callback()
             if self._client and self._client.is_connected:
                 try:
-                    await self._client.stop_notify(READ_CHARACTERISTIC_UUID)
+                    await self._client.stop_notify(self.read_characteristic)
                     await self._client.disconnect()
                     _LOGGER.debug(f"Disconnected from {self.address}")
                 except Exception as e:
                     _LOGGER.warning(f"Error disconnecting from {self.address}: {e}")
                 finally:
                     self._client = None
+            self._return_slot()
 
-    async def _transmitPacket(self, packet: LedPacket):
-        """ transmit the actiual packet """
+    async def reset(self):
+        """Reset connection state and failure counters."""
+        self._cancel_idle_timer()
+        if self._keep_alive_task:
+            self._keep_alive_task.cancel()
+            self._keep_alive_task = None
+        async with self._connection_lock:
+            self.breaker.reset()
+            await self._cleanup_connection()
+            self._return_slot()
+            _LOGGER.info(f"Reset connection state for {self.address}")
+
+class GoveeAPI:
+    state: bool | None = None
+    brightness: int | None = None
+    color: tuple[int, ...] | None = None
+    current_effect: str | None = None
+    music_mode_enabled: bool = False
+    segments: tuple[tuple[int, int, int] | None, ...] | None = None
+
+    def __init__(
+        self,
+        ble_device: BLEDevice,
+        update_callback,
+        segmented: bool = False,
+        connection_policy: str = DEFAULT_CONNECTION_POLICY,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        scheduler: GoveeConnectionScheduler | None = None,
+        optimistic: bool = False,
+        path_resolver: Callable[[], list[PathCandidate]] | None = None,
+    ):
+        self._segmented = segmented
+        self._optimistic = optimistic
+        #optimistic values waiting for confirmation, field -> (expected, previous, set at)
+        self._expectations: dict[str, tuple] = {}
+        self._expiry_timer: asyncio.TimerHandle | None = None
+        self._scheduler = scheduler
+        #one burst at a time per light, user commands are admitted ahead of polls
+        self._queue = PriorityGate(1)
+        #priority of the burst holding the queue, None while idle
+        self._turn_priority: int | None = None
+        #set when a user command waits behind a poll, the poll stops early
+        self._preempt = asyncio.Event()
+        #monotonic time each state field was last confirmed by the device
+        self._field_updated: dict[str, float] = {}
+        #response decoders keyed by (head, cmd)
+        self._decoders = {
+            (LedPacketHead.REQUEST, LedPacketCmd.POWER): self._decodePower,
+            (LedPacketHead.REQUEST, LedPacketCmd.BRIGHTNESS): self._decodeBrightness,
+            (LedPacketHead.REQUEST, LedPacketCmd.COLOR): self._decodeColor,
+            (LedPacketHead.REQUEST, LedPacketCmd.SEGMENT): self._decodeSegment,
+            (LedPacketHead.REQUEST, LedPacketCmd.MUSIC_MODE): self._decodeMusicMode,
+            (LedPacketHead.REQUEST, LedPacketCmd.EFFECT): self._decodeEffect,
+            (LedPacketHead.REQUEST, LedPacketCmd.SCENE): self._decodeEffect,
+        }
+        #last frame and time received per response key, to drop repeated echoes
+        self._last_frames: dict[tuple, tuple[bytes, float]] = {}
+        #latest packet per coalescing key, insertion ordered
+        self._packet_buffer: dict[tuple, LedPacket] = {}
+        #state fields read back in one snapshot after the buffered burst
+        self._buffered_reads: set[str] = set()
+        #adaptive pacing derived from observed write completions
+        self._write_time = PACKET_DELAY_MIN
+        self._packet_delay = PACKET_DELAY_MIN
+        #set while a link opened by prime() waits for the burst that releases it
+        self._primed = False
+        #running transition or other frame stream
+        self._animation_task: asyncio.Task | None = None
+        #brightness before a fade out, the next power on returns to it
+        self._resume_brightness: float | None = None
+        self._stream_frame = bytearray(FRAME_LENGTH)
+        #host side effect currently played and compiled schedules by effect and interval
+        self._sequence_effect: str | None = None
+        self._compiled_effects: dict[tuple[EffectDefinition, float], CompiledEffect] = {}
+        #outstanding commands waiting for their echo, keyed by GoveeUtils.ackKey
+        self._pending_acks: dict[tuple[int, int], asyncio.Future] = {}
+        self._update_callback = update_callback
+        self._conn = GoveeConnectionManager(
+            ble_device,
+            self._handleReceive,
+            connection_policy,
+            idle_timeout,
+            keep_alive_callback=self._keepAlive,
+            disconnected_callback=self._failPendingAcks,
+            path_resolver=path_resolver,
+            scheduler=scheduler,
+        )
+
+    @property
+    def address(self):
+        return self._conn.address
+
+    async def _ensureConnected(self):
+        """Ensures a connection to the bluetooth device."""
+        await self._conn.ensure_connected(PRIORITY_USER if self._turn_priority is None else self._turn_priority)
+
+    @asynccontextmanager
+    async def _slot(self, priority: int):
+        """ waits for the turn of this light, the adapter slot is taken when connecting """
+        queued = time.monotonic()
+        if self._turn_priority is not None and priority < self._turn_priority:
+            #a user command cuts a running poll short
+            self._preempt.set()
+        await self._queue.acquire(priority)
+        try:
+            self.metrics.queue_wait.observe(time.monotonic() - queued)
+            self._turn_priority = priority
+            self._preempt.clear()
+            #choose the path first so the slot is taken on the adapter that will connect
+            self._conn.select_path()
+            yield
+        finally:
+            self._turn_priority = None
+            self._queue.release()
+
+    @property
+    def queue_depth(self) -> int:
+        """Bursts running or waiting for this light."""
+        return self._queue.active + self._queue.waiting
+
+    @property
+    def animating(self) -> bool:
+        """True while a transition, stream or effect holds the light."""
+        return self._animation_task is not None and not self._animation_task.done()
+
+    def _slotContended(self) -> bool:
+        """ returns True if other lights are waiting for our adapter """
+        return self._scheduler is not None and self._scheduler.gate(self._conn.source).waiting > 0
+
+    def _expectAck(self, packet: LedPacket) -> asyncio.Future:
+        """ registers a future that resolves when the device echoes the packet """
+        ack = asyncio.get_running_loop().create_future()
+        self._pending_acks[GoveeUtils.ackKey(packet.head, packet.cmd, packet.payload)] = ack
+        return ack
+
+    def _dropAck(self, packet: LedPacket, ack: asyncio.Future):
+        """ forgets an outstanding acknowledgement """
+        key = GoveeUtils.ackKey(packet.head, packet.cmd, packet.payload)
+        if self._pending_acks.get(key) is ack:
+            del self._pending_acks[key]
+        if ack.done() and not ack.cancelled():
+            #mark a failure as retrieved
+            ack.exception()
+
+    async def _writePacket(self, packet: LedPacket):
+        """ writes the frame of a packet without waiting for its echo """
         #convert to bytes
-        frame = await GoveeUtils.generateFrame(packet)
-        #transmit to UUID
-        await self._client.write_gatt_char(WRITE_CHARACTERISTIC_UUID, frame, False)
-
-    async def _handleRequest(self, packet: LedPacket):
-        """ process received responses """
-        match packet.cmd:
-            case LedPacketCmd.POWER:
-                self.state = packet.payload[0] == 0x01
-            case LedPacketCmd.BRIGHTNESS:
-                #segmented devices 0-100
-                self.brightness = packet.payload[0] / 100 * 255 if self._segmented else packet.payload[0]
-            case LedPacketCmd.COLOR:
-                red = packet.payload[1]
-                green = packet.payload[2]
-                blue = packet.payload[3]
-                self.color = (red, green, blue)
-            case LedPacketCmd.SEGMENT:
-                red = packet.payload[2]
-                green = packet.payload[3]
-                blue = packet.payload[4]
-                self.color = (red, green, blue)
-            case LedPacketCmd.MUSIC_MODE:
-                if len(packet.payload) > 0:
-                    mode_value = packet.payload[0]
-                    self.music_mode_enabled = mode_value != 0x00
-                    # Find the effect name from the mode value
-                    for effect_name, effect_value in EFFECT_MAP.items():
-                        if effect_value == mode_value:
-                            self.current_effect = effect_name
-                            break
-                    else:
-                        self.current_effect = None if mode_value == 0x00 else f"Unknown_{mode_value:02x}"
-            case LedPacketCmd.EFFECT | LedPacketCmd.SCENE:
-                if len(packet.payload) > 0:
-                    mode_value = packet.payload[0]
-                    # Find the effect name from the mode value
-                    for effect_name, effect_value in EFFECT_MAP.items():
-                        if effect_value == mode_value:
-                            self.current_effect = effect_name
-                            break
-                    else:
-                        self.current_effect = f"Unknown_{mode_value:02x}" if mode_value != 0x00 else None
+        await self._writeFrame(GoveeUtils.generateFrame(packet))
+
+    async def _writeFrame(self, frame: bytes | bytearray):
+        """ writes a complete frame without waiting for its echo """
+        started = time.monotonic()
+        try:
+            #transmit to UUID
+            await self._conn.client.write_gatt_char(self._conn.write_characteristic, frame, False)
+        except Exception:
+            #back off the pacing while the link struggles
+            self._packet_delay = min(self._packet_delay * 2, PACKET_DELAY_MAX)
+            raise
+        write_time = time.monotonic() - started
+        self.metrics.write_latency.observe(write_time)
+        self._updatePacing(write_time)
+
+    async def _transmitPacket(self, packet: LedPacket):
+        """ transmit the actual packet, returns True once the device echoed it back """
+        ack = self._expectAck(packet)
+        started = time.monotonic()
+        self.metrics.packets_sent += 1
+        try:
+            await self._writePacket(packet)
+            #the device echoes every frame on the notify characteristic
+            await asyncio.wait_for(asyncio.shield(ack), ACK_TIMEOUT)
+            #a whole light color repaints segments the read back does not cover
+            self._paintSegments(packet)
+            self.metrics.packets_acked += 1
+            self.metrics.ack_round_trip.observe(time.monotonic() - started)
+            return True
+        except asyncio.TimeoutError:
+            _LOGGER.debug(f"No acknowledgement for {packet.head:#04x}/{packet.cmd:#04x} from {self.address} within {ACK_TIMEOUT}s")
+            return False
+        except Exception as e:
+            _LOGGER.debug(f"Write of {packet.cmd:#04x} to {self.address} failed: {e}")
+            return False
+        finally:
+            self._dropAck(packet, ack)
+
+    def _resolveAck(self, head: int, cmd: int, payload: bytes):
+        """ completes the outstanding command matching a received frame """
+        ack = self._pending_acks.pop(GoveeUtils.ackKey(head, cmd, payload), None)
+        if ack and not ack.done():
+            ack.set_result(True)
+
+    def _failPendingAcks(self):
+        """ aborts all outstanding commands, e.g. when the link went away """
+        for ack in self._pending_acks.values():
+            if not ack.done():
+                ack.set_exception(ConnectionError(f"Connection to {self.address} closed"))
+        self._pending_acks = {}
+
+    def _updatePacing(self, write_time: float):
+        """ adapt the inter-packet delay to the observed write completion time """
+        #exponentially weighted moving average of the write completion time
+        self._write_time = self._write_time * 0.8 + write_time * 0.2
+        self._packet_delay = min(max(self._write_time * PACKET_PACING_FACTOR, PACKET_DELAY_MIN), PACKET_DELAY_MAX)
+
+    def _markFresh(self, field: str):
+        """ remembers when a state field was last confirmed """
+        self._field_updated[field] = time.monotonic()
+
+    def _shows(self, field: str, value) -> bool:
+        """ returns True if the device is known to show value, a persisted value counts only once it was confirmed """
+        return field in self._field_updated and getattr(self, self._fieldAttribute(field)) == value
+
+    def staleFields(self, max_age: float, music_mode: bool = False) -> set[str]:
+        """ returns the state fields that are unknown or older than max_age seconds """
+        fields = ["state", "brightness", "color"]
+        if music_mode:
+            fields.append("effect")
+        now = time.monotonic()
+        return {
+            field for field in fields
+            if now - self._field_updated.get(field, float("-inf")) > max_age
+        }
+
+    def applyCached(self, data: GoveeApiData):
+        """ takes over a persisted state, the fields stay stale until the device confirms them """
+        self.state = data.state
+        self.brightness = data.brightness
+        self.color = data.color
+        self.current_effect = data.current_effect
+        self.music_mode_enabled = data.music_mode_enabled
+        self.segments = data.segments
+
+    def applyAdvertisement(self, fields: dict) -> bool:
+        """ applies state decoded from an advertisement, returns True if anything changed """
+        changed = False
+        for field, value in fields.items():
+            if getattr(self, self._fieldAttribute(field)) != value or field in self._expectations:
+                changed = True
+            self._applyField(field, value)
+        return changed
+
+    @staticmethod
+    def _fieldAttribute(field: str) -> str:
+        """ returns the attribute holding a state field """
+        return "current_effect" if field == "effect" else field
+
+    def _applyField(self, field: str, value):
+        """ applies a value reported by the device and reconciles it with an optimistic one """
+        expectation = self._expectations.pop(field, None)
+        if expectation is not None:
+            expected = expectation[0]
+            if field == "brightness":
+                #the device reports brightness at its own resolution
+                matches = expected is not None and abs(expected - value) <= 255 / 100
+            else:
+                matches = expected == value
+            if not matches:
+                _LOGGER.warning(f"{self.address} reported {field} {value}, expected {expected}")
+        setattr(self, self._fieldAttribute(field), value)
+        self._markFresh(field)
+
+    def _expect(self, field: str, value):
+        """ publishes a commanded value before the device confirms it, in optimistic mode """
+        if not self._optimistic:
+            return
+        attribute = self._fieldAttribute(field)
+        #keep the last confirmed value when a change overrides an unconfirmed one
+        previous = self._expectations[field][1] if field in self._expectations else getattr(self, attribute)
+        self._expectations[field] = (value, previous, time.monotonic())
+        setattr(self, attribute, value)
+        if self._expiry_timer is None:
+            self._expiry_timer = asyncio.get_running_loop().call_later(OPTIMISTIC_TIMEOUT, self._expireExpectations)
+
+    def _expireExpectations(self):
+        """ rolls back optimistic values the device did not confirm in time """
+        self._expiry_timer = None
+        if self.rollbackExpectations(time.monotonic() - OPTIMISTIC_TIMEOUT, "timed out"):
+            asyncio.get_running_loop().create_task(self._update_callback())
+        if self._expectations:
+            oldest = min(set_at for _, _, set_at in self._expectations.values())
+            self._expiry_timer = asyncio.get_running_loop().call_later(
+                max(oldest + OPTIMISTIC_TIMEOUT - time.monotonic(), 0), self._expireExpectations
+            )
+
+    def rollbackExpectations(self, set_before: float = float("inf"), reason: str = "failed") -> bool:
+        """ restores the confirmed values of optimistic changes made before set_before, returns True if any """
+        fields = [field for field, (_, _, set_at) in self._expectations.items() if set_at <= set_before]
+        for field in fields:
+            expected, previous, _ = self._expectations.pop(field)
+            _LOGGER.warning(f"{self.address} {field} change to {expected} {reason}, restoring {previous}")
+            setattr(self, self._fieldAttribute(field), previous)
+        if not self._expectations and self._expiry_timer is not None:
+            self._expiry_timer.cancel()
+            self._expiry_timer = None
+        return bool(fields)
+
+    @property
+    def pending_expectations(self) -> int:
+        return len(self._expectations)
+
+    def _decodePower(self, payload: memoryview):
+        self._applyField("state", payload[0] == 0x01)
+
+    def _decodeBrightness(self, payload: memoryview):
+        #segmented devices 0-100
+        self._applyField("brightness", payload[0] / 100 * 255 if self._segmented else payload[0])
+
+    def _decodeColor(self, payload: memoryview):
+        self._applyField("color", (payload[1], payload[2], payload[3]))
+
+    def _decodeSegment(self, payload: memoryview):
+        group = payload[0]
+        segments = list(self.segments or [None] * SEGMENT_COUNT)
+        #each entry is brightness, red, green, blue
+        for index in range(SEGMENTS_PER_GROUP):
+            segment = (group - 1) * SEGMENTS_PER_GROUP + index
+            offset = 1 + index * 4
+            if 0 <= segment < SEGMENT_COUNT and offset + 3 < len(payload):
+                segments[segment] = (payload[offset + 1], payload[offset + 2], payload[offset + 3])
+        self.segments = tuple(segments)
+        self._markFresh("segments")
+        if group == 0x01:
+            self._applyField("color", segments[0])
+
+    def _paintSegments(self, packet: LedPacket):
+        """ takes over the colors a segment color command put on the segments it addresses """
+        mask = GoveeUtils.segmentMask(packet)
+        if mask is None:
+            return
+        color = tuple(packet.payload[2:5])
+        segments = self.segments or (None,) * SEGMENT_COUNT
+        self.segments = tuple(color if mask & (1 << index) else segment for index, segment in enumerate(segments))
+        #the cache changed without an answer, the next identical answer is news again
+        self._last_frames.clear()
+
+    def _showsColor(self, color: tuple[int, int, int] | None) -> bool:
+        """ returns True if the whole light is known to show color, segmented lights on every segment """
+        if color is None or not self._shows("color", tuple(color)):
+            return False
+        return not self._segmented or self._shows("segments", (tuple(color),) * SEGMENT_COUNT)
+
+    def _showColor(self, color: tuple[int, int, int]):
+        """ takes over a whole light color sent without confirmation, it covers every segment """
+        self._expectations.pop("color", None)
+        self.color = color
+        if self._segmented:
+            self.segments = (tuple(color),) * SEGMENT_COUNT
+        self._last_frames.clear()
+
+    def _decodeMusicMode(self, payload: memoryview):
+        mode_value = payload[0]
+        self.music_mode_enabled = mode_value != 0x00
+        self._applyField("effect", GoveeUtils.effectName(mode_value))
+
+    def _decodeEffect(self, payload: memoryview):
+        self._applyField("effect", GoveeUtils.effectName(payload[0]))
 
     async def _handleReceive(self, characteristic: BleakGATTCharacteristic, frame: bytearray):
-        """ receives packets async """
-        if not await GoveeUtils.verifyChecksum(frame):
+        """ receives packets async and decodes them straight from the notification buffer """
+        self.metrics.notifications += 1
+        if not GoveeUtils.verifyChecksum(frame):
             raise Exception("transmission error, received packet with bad checksum")
-        
-        packet = LedPacket(
-            head=frame[0],
-            cmd=frame[1],
-            payload=frame[2:-1]
-        )
+
+        head = frame[0]
+        cmd = frame[1]
+        payload = memoryview(frame)[2:-1]
+        key = GoveeUtils.ackKey(head, cmd, payload)
+        #the device often echoes the same answer more than once
+        now = time.monotonic()
+        previous = self._last_frames.get(key)
+        duplicate = previous is not None and previous[0] == frame and now - previous[1] < DUPLICATE_WINDOW
+        self._last_frames[key] = (bytes(frame), now)
+
         #only requests are expected to send a response
-        if packet.head == LedPacketHead.REQUEST:
-            await self._handleRequest(packet)
+        decoder = None if duplicate else self._decoders.get((head, cmd))
+        if decoder:
+            decoder(payload)
+        #resolve after the state was applied so waiters see the new value
+        self._resolveAck(head, cmd, payload)
+        if decoder:
             await self._update_callback()
 
-    async def _preparePacket(self, cmd: LedPacketCmd, payload: bytes | list = b'', request: bool = False, repeat: int = 3):
-        """ add data to transmission buffer """
+    async def _preparePacket(self, cmd: LedPacketCmd, payload: bytes | list = b'', request: bool = False):
+        """ add data to transmission buffer, superseding any queued packet with the same key """
         #request data or perform a change
         head = LedPacketHead.REQUEST if request else LedPacketHead.COMMAND
         packet = LedPacket(head, cmd, payload)
-        for index in range(repeat):
-            self._packet_buffer.append(packet)
+        key = GoveeUtils.coalesceKey(packet)
+        mask = GoveeUtils.segmentMask(packet)
+        if mask is not None:
+            #a segment frame also replaces queued frames for a subset of its segments
+            for queued_key, queued in list(self._packet_buffer.items()):
+                queued_mask = GoveeUtils.segmentMask(queued)
+                if queued_mask is not None and queued_mask & ~mask == 0:
+                    del self._packet_buffer[queued_key]
+        #drop the superseded value and queue the latest one at the end
+        self._packet_buffer.pop(key, None)
+        self._packet_buffer[key] = packet
 
     async def _clearPacketBuffer(self):
         """ clears the packet buffer """
-        self._packet_buffer = []
+        self._packet_buffer = {}
+        self._buffered_reads = set()
+
+    async def prime(self, priority: int = PRIORITY_USER):
+        """Opens the connection ahead of a burst that must start without setup delay.
+
+        The link stays busy, so neither the connection policy nor another
+        light takes it away, until the next sendPacketBuffer releases it.
+        """
+        async with self._slot(priority):
+            await self._ensureConnected()
+            self._primed = True
 
-    async def sendPacketBuffer(self):
-        """Transmits all buffered data with improved error handling."""
+    def _releasePrimed(self):
+        """ hands a link opened by prime() back to the connection policy """
+        if self._primed:
+            self._primed = False
+            self._conn.release(self._slotContended())
+
+    async def sendPacketBuffer(self, priority: int = PRIORITY_USER):
+        """Transmits all buffered data once, retransmitting only unacknowledged packets.
+
+        Waits for the turn of this light and a connection slot of the shared
+        adapter first, user commands are admitted ahead of background polls.
+        A user command whose connection fails is retried a limited number of
+        times, unless the device is known to be unreachable.
+        Returns True when every packet was acknowledged by the device.
+        """
         if not self._packet_buffer:
-            # Nothing to do
-            return None
-            
+            # Nothing to do, a primed link is not needed any more
+            self._releasePrimed()
+            return True
+
+        if priority == PRIORITY_USER:
+            # A new command replaces a running fade
+            await self.cancelAnimation()
+
+        # Take the burst now, commands buffered while it waits or retries form the next one
+        pending = list(self._packet_buffer.values())
+        reads = self._buffered_reads
+        await self._clearPacketBuffer()
+        attempts = COMMAND_RETRY_LIMIT + 1 if priority == PRIORITY_USER else 1
+        started = time.monotonic()
+        confirmed = False
         try:
-            await self._ensureConnected()
-            
-            # Send all packets
-            for i, packet in enumerate(self._packet_buffer):
+            for attempt in range(attempts):
+                if attempt > 0:
+                    await asyncio.sleep(COMMAND_RETRY_DELAY * 2 ** (attempt - 1))
+                if self._conn.breaker.rejecting and not self.is_connected:
+                    # Dead lights cost neither a slot nor radio time
+                    self._conn.check_circuit()
                 try:
-                    await self._transmitPacket(packet)
-                    # Small delay between packets to avoid overwhelming the device
-                    if i < len(self._packet_buffer) - 1:
-                        await asyncio.sleep(0.05)  # 50ms delay
+                    async with self._slot(priority):
+                        confirmed = await self._sendPacketBuffer(pending)
+                    break
+                except (CircuitOpenError, SlotTimeoutError):
+                    #retrying cannot help, other lights hold every slot
+                    raise
                 except Exception as e:
-                    _LOGGER.warning(f"Failed to transmit packet {i+1}/{len(self._packet_buffer)} to {self.address}: {e}")
-                    # Don't break the loop, try to send remaining packets
-                    
-            await self._clearPacketBuffer()
+                    if attempt + 1 == attempts:
+                        _LOGGER.error(f"Failed to send packet buffer to {self.address}: {e}")
+                        raise
+                    _LOGGER.debug(f"Sending {len(pending)} packet(s) to {self.address} failed, retrying: {e}")
+        finally:
+            if not confirmed and self.rollbackExpectations(started, "was not confirmed"):
+                await self._update_callback()
+        if reads:
+            # One pipelined read instead of a paced query per packet
+            try:
+                await self.requestSnapshot(reads, priority=priority)
+            except Exception as e:
+                _LOGGER.debug(f"Reading back {', '.join(sorted(reads))} of {self.address} failed: {e}")
+        return confirmed
+
+    async def _sendPacketBuffer(self, pending: list[LedPacket]) -> bool:
+        """ transmits a burst, removing each packet from pending once it was acknowledged """
+        try:
+            await self._ensureConnected()
+
+            for attempt in range(PACKET_RETRY_LIMIT + 1):
+                if attempt > 0:
+                    _LOGGER.debug(f"Retrying {len(pending)} packet(s) to {self.address}, attempt {attempt + 1}")
+                    await self._ensureConnected()
+                for packet in list(pending):
+                    if await self._transmitPacket(packet):
+                        pending.remove(packet)
+                    else:
+                        # Give the link room before the next write
+                        await asyncio.sleep(self._packet_delay)
+                if not pending:
+                    break
+
+            if pending:
+                _LOGGER.warning(f"{len(pending)} packet(s) to {self.address} were not acknowledged after {PACKET_RETRY_LIMIT + 1} attempts")
+                return False
             _LOGGER.debug(f"Successfully sent packet buffer to {self.address}")
-            
-        except Exception as e:
-            _LOGGER.error(f"Failed to send packet buffer to {self.address}: {e}")
-            # Clear buffer even on failure to prevent infinite retries
-            await self._clearPacketBuffer()
-            raise
+            return True
+        finally:
+            self._primed = False
+            self._conn.release(self._slotContended())
+
+    def _requestPackets(self, field: str) -> list[LedPacket]:
+        """ returns the query packets for a state field """
+        match field:
+            case "state":
+                return [LedPacket(LedPacketHead.REQUEST, LedPacketCmd.POWER)]
+            case "brightness":
+                return [LedPacket(LedPacketHead.REQUEST, LedPacketCmd.BRIGHTNESS)]
+            case "color" if self._segmented:
+                #0x01 means first segment
+                return [LedPacket(LedPacketHead.REQUEST, LedPacketCmd.SEGMENT, b'\x01')]
+            case "color":
+                return [LedPacket(LedPacketHead.REQUEST, LedPacketCmd.COLOR)]
+            case "effect":
+                return [LedPacket(LedPacketHead.REQUEST, LedPacketCmd.MUSIC_MODE)]
+            case "segments":
+                #every response carries SEGMENTS_PER_GROUP segments
+                return [
+                    LedPacket(LedPacketHead.REQUEST, LedPacketCmd.SEGMENT, bytes([group + 1]))
+                    for group in range(SEGMENT_GROUPS)
+                ]
+        raise ValueError(f"Unknown state field {field}")
+
+    def snapshot(self) -> GoveeApiData:
+        """ returns the current state """
+        return GoveeApiData(
+            state=self.state,
+            brightness=self.brightness,
+            color=self.color,
+            current_effect=self._sequence_effect or self.current_effect,
+            music_mode_enabled=self.music_mode_enabled,
+            segments=self.segments
+        )
+
+    async def requestSnapshot(
+        self,
+        fields: set[str] | None = None,
+        music_mode: bool = False,
+        priority: int = PRIORITY_POLL,
+        timeout: float = SNAPSHOT_TIMEOUT,
+    ) -> tuple[GoveeApiData, set[str]]:
+        """Queries every state field once and waits for all responses together.
+
+        The queries are written back to back without pacing sleeps. A user
+        command arriving meanwhile ends a background snapshot early, answers
+        still in flight are applied when they arrive. Returns the resulting
+        state and the fields that did not answer in time.
+        """
+        if fields is None:
+            fields = {"state", "brightness", "color"}
+            if music_mode:
+                fields.add("effect")
+
+        async with self._slot(priority):
+            try:
+                await self._ensureConnected()
+                #one query per distinct packet, shared by the fields needing it
+                pending: dict[tuple, tuple[LedPacket, asyncio.Future, set[str]]] = {}
+                #fields not queried before a user command preempted the snapshot
+                stale = set(fields)
+                for field in fields:
+                    if self._preempt.is_set():
+                        break
+                    stale.discard(field)
+                    for packet in self._requestPackets(field):
+                        key = GoveeUtils.ackKey(packet.head, packet.cmd, packet.payload)
+                        if key in pending:
+                            pending[key][2].add(field)
+                            continue
+                        pending[key] = (packet, self._expectAck(packet), {field})
+                        try:
+                            await self._writePacket(packet)
+                        except Exception as e:
+                            _LOGGER.debug(f"Write of {field} query to {self.address} failed: {e}")
+                await self._waitAnswers([ack for _, ack, _ in pending.values()], timeout)
+                for packet, ack, waiting_fields in pending.values():
+                    if not ack.done() or ack.cancelled() or ack.exception():
+                        stale |= waiting_fields
+                    self._dropAck(packet, ack)
+            finally:
+                self._conn.release(self._slotContended())
+
+        if stale:
+            _LOGGER.debug(f"Snapshot of {self.address} is stale for {', '.join(sorted(stale))}")
+        return self.snapshot(), stale
+
+    async def _waitAnswers(self, acks: list[asyncio.Future], timeout: float):
+        """ waits for all answers, returning early when a user command preempts the burst """
+        if not acks:
+            return
+        #exceptions are read from the acks themselves afterwards
+        answers = asyncio.gather(*acks, return_exceptions=True)
+        preempted = asyncio.ensure_future(self._preempt.wait())
+        try:
+            await asyncio.wait([answers, preempted], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            preempted.cancel()
+        if self._preempt.is_set():
+            _LOGGER.debug(f"Snapshot of {self.address} preempted by a user command")
 
     async def requestStateBuffered(self):
         """ adds a request for the current power state to the transmit buffer """
@@ -275,82 +1014,448 @@ class GoveeAPI:
             #legacy devices
             await self._preparePacket(LedPacketCmd.COLOR, request=True)
     
+    async def requestSegmentsBuffered(self):
+        """ adds requests for the colors of all segments to the transmit buffer """
+        for packet in self._requestPackets("segments"):
+            await self._preparePacket(packet.cmd, packet.payload, request=True)
+
     async def requestMusicModeBuffered(self):
         """ adds a request for the current music mode state to the transmit buffer """
         await self._preparePacket(LedPacketCmd.MUSIC_MODE, request=True)
     
     async def setStateBuffered(self, state: bool):
         """ adds the state to the transmit buffer """
-        if self.state == state:
+        if state and self._resume_brightness is not None:
+            #the light was faded out, do not come back dark
+            await self.setBrightnessBuffered(self._resume_brightness)
+        if self._shows("state", state):
             return None #nothing to do
         #0x1 = ON, Ox0 = OFF
         await self._preparePacket(LedPacketCmd.POWER, [0x1 if state else 0x0])
         await self.requestStateBuffered()
+        self._expect("state", state)
     
-    async def setBrightnessBuffered(self, brightness: int):
-        """ adds the brightness to the transmit buffer """
-        if self.brightness == brightness:
-            return None #nothing to do
+    def _brightnessPacket(self, brightness: float) -> LedPacket:
+        """ returns the brightness command for a 0-255 brightness """
         #legacy devices 0-255
         payload = round(brightness)
         if self._segmented:
             #segmented devices 0-100
             payload = round(brightness / 255 * 100)
-        await self._preparePacket(LedPacketCmd.BRIGHTNESS, [payload])
+        return LedPacket(LedPacketHead.COMMAND, LedPacketCmd.BRIGHTNESS, [payload])
+
+    def _colorPackets(self, red: int, green: int, blue: int) -> list[LedPacket]:
+        """ returns the color commands for the device type """
+        if self._segmented:
+            return [LedPacket(LedPacketHead.COMMAND, LedPacketCmd.COLOR, [LedColorType.SEGMENTS, 0x01, red, green, blue, 0, 0, 0, 0, 0, 0xff, 0xff])]
+        #legacy devices
+        return [
+            LedPacket(LedPacketHead.COMMAND, LedPacketCmd.COLOR, [LedColorType.SINGLE, red, green, blue]),
+            LedPacket(LedPacketHead.COMMAND, LedPacketCmd.COLOR, [LedColorType.LEGACY, red, green, blue])
+        ]
+
+    async def setBrightnessBuffered(self, brightness: int):
+        """ adds the brightness to the transmit buffer """
+        self._resume_brightness = None
+        if self._shows("brightness", brightness):
+            return None #nothing to do
+        packet = self._brightnessPacket(brightness)
+        await self._preparePacket(packet.cmd, packet.payload)
         await self.requestBrightnessBuffered()
+        self._expect("brightness", brightness)
         
     async def setColorBuffered(self, red: int, green: int, blue: int):
         """ adds the color to the transmit buffer """
-        if self.color == (red, green, blue):
+        if self._showsColor((red, green, blue)):
             return None #nothing to do
-        if self._segmented:
-            await self._preparePacket(LedPacketCmd.COLOR, [LedColorType.SEGMENTS, 0x01, red, green, blue, 0, 0, 0, 0, 0, 0xff, 0xff])
-        else:
-            #legacy devices
-            await self._preparePacket(LedPacketCmd.COLOR, [LedColorType.SINGLE, red, green, blue])
-            await self._preparePacket(LedPacketCmd.COLOR, [LedColorType.LEGACY, red, green, blue])
+        for packet in self._colorPackets(red, green, blue):
+            await self._preparePacket(packet.cmd, packet.payload)
         await self.requestColorBuffered()
+        self._expect("color", (red, green, blue))
+
+    async def setSegmentColorsBuffered(self, colors: list[tuple[int, int, int] | None]):
+        """Adds per segment colors to the transmit buffer.
+
+        Segments sharing a color are painted by one frame with a combined
+        segment mask, None leaves a segment unchanged.
+        """
+        if not self._segmented:
+            raise ValueError(f"{self.address} has no individually controllable segments")
+        packets = self._segmentPackets(colors)
+        if not packets:
+            return None
+        for packet in packets:
+            await self._preparePacket(packet.cmd, packet.payload)
+        self._buffered_reads.add("segments")
+
+    def _segmentPackets(self, colors, skip_known: bool = True) -> list[LedPacket]:
+        """ returns the commands painting segments, optionally skipping those known to show their color """
+        masks: dict[tuple[int, int, int], int] = {}
+        for index, color in enumerate(colors[:SEGMENT_COUNT]):
+            if color is None:
+                continue
+            color = tuple(color)
+            if skip_known and "segments" in self._field_updated and self.segments and self.segments[index] == color:
+                continue #nothing to do
+            masks[color] = masks.get(color, 0) | (1 << index)
+        return [
+            LedPacket(LedPacketHead.COMMAND, LedPacketCmd.COLOR, [LedColorType.SEGMENTS, 0x01, red, green, blue, 0, 0, 0, 0, 0, mask & 0xff, mask >> 8])
+            for (red, green, blue), mask in masks.items()
+        ]
+
+    def _restoreChanges(self, target: GoveeApiData) -> list[tuple[str, object, list[LedPacket]]]:
+        """ returns the fields differing from target with their commands, in the order they must be sent """
+        changes = []
+        if target.state is not None and not self._shows("state", target.state):
+            changes.append(("state", target.state, [LedPacket(LedPacketHead.COMMAND, LedPacketCmd.POWER, [0x1 if target.state else 0x0])]))
+        if target.state is False:
+            #nothing else is visible while off
+            return changes
+        if target.brightness is not None:
+            packet = self._brightnessPacket(target.brightness)
+            #compared at device resolution, segmented lights only know whole percents
+            if (
+                "brightness" not in self._field_updated or self.brightness is None
+                or packet.payload != self._brightnessPacket(self.brightness).payload
+            ):
+                changes.append(("brightness", target.brightness, [packet]))
+        if target.current_effect in EFFECT_MAP:
+            if not self._shows("effect", target.current_effect):
+                changes.append(("effect", target.current_effect, [self._effectPacket(target.current_effect)]))
+            return changes
+        #a static color also ends a running device effect
+        leave_effect = self.current_effect is not None
+        if self._segmented and target.segments:
+            packets = self._segmentPackets(target.segments, skip_known=not leave_effect)
+            if packets:
+                changes.append(("segments", target.segments, packets))
+        elif target.color is not None and (not self._showsColor(target.color) or leave_effect):
+            changes.append(("color", target.color, self._colorPackets(*target.color)))
+        return changes
+
+    def restoreFrames(self, target: GoveeApiData) -> int:
+        """ returns the number of commands restoring target would send, 0 if nothing differs """
+        return sum(len(packets) for _, _, packets in self._restoreChanges(target))
+
+    async def restoreState(self, target: GoveeApiData, priority: int = PRIORITY_USER) -> bool:
+        """Applies a captured state with the fewest commands.
+
+        Only differing fields are sent, in one ordered burst followed by a
+        single read verifying the last change. Segment colors are read from
+        the device before the deltas are computed and all of them are read
+        back afterwards. Returns True when the device acknowledged everything
+        and shows the captured segments.
+        """
+        restore_segments = (
+            self._segmented and bool(target.segments) and target.state is not False
+            and target.current_effect not in EFFECT_MAP
+        )
+        if restore_segments:
+            #the cache may miss changes made elsewhere, only trust what the device reports
+            _, stale = await self.requestSnapshot({"segments"}, priority=priority)
+            if "segments" in stale:
+                self.segments = None
+        changes = self._restoreChanges(target)
+        if not changes:
+            return True
+        for field, value, packets in changes:
+            for packet in packets:
+                await self._preparePacket(packet.cmd, packet.payload)
+            self._expect(field, value)
+        #the device applies commands in order, reading back the last one verifies the burst
+        verified = changes[-1][0]
+        if verified == "segments":
+            #every group, the first one alone says nothing about the others
+            self._buffered_reads.add("segments")
+        else:
+            for packet in self._requestPackets(verified)[:1]:
+                await self._preparePacket(packet.cmd, packet.payload, request=True)
+        if not await self.sendPacketBuffer(priority):
+            return False
+        #the remaining fields were confirmed by their echoes
+        for field, value, _ in changes:
+            if field != verified:
+                self._applyField(field, value)
+        if restore_segments and not self._showsSegments(target.segments):
+            _LOGGER.warning(f"{self.address} does not show the restored segment colors")
+            return False
+        return True
+
+    def _showsSegments(self, colors) -> bool:
+        """ returns True if every segment with a color in colors is known to show it """
+        if not self.segments:
+            return False
+        return all(
+            color is None or self.segments[index] == tuple(color)
+            for index, color in enumerate(colors[:SEGMENT_COUNT])
+        )
+
+    async def cancelAnimation(self):
+        """ stops a running transition or other frame stream """
+        task = self._animation_task
+        if task is None or task.done() or task is asyncio.current_task():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        _LOGGER.debug(f"Cancelled running animation on {self.address}")
+
+    async def startTransition(self, duration: float, brightness: float | None = None, color: tuple[int, int, int] | None = None):
+        """Fades to the target brightness and/or color over duration seconds.
+
+        The fade runs in the background over one held connection, any new
+        user command cancels it.
+        """
+        await self.cancelAnimation()
+        start_brightness = self.brightness if self.state and self.brightness is not None else 0
+        start_color = self.color or color
+        if brightness is not None:
+            #the fade sets the brightness itself
+            self._resume_brightness = None
+        if not self.state:
+            #power on dark so the fade does not start with a flash
+            if brightness is not None:
+                packet = self._brightnessPacket(0)
+                await self._preparePacket(packet.cmd, packet.payload)
+            await self.setStateBuffered(True)
+            await self.sendPacketBuffer()
+        self._animation_task = asyncio.create_task(
+            self._runTransition(duration, start_brightness, brightness, start_color, color)
+        )
+
+    async def startFadeOut(self, duration: float):
+        """Fades the brightness to zero over duration seconds, then powers off.
+
+        The brightness before the fade is restored by the next power on.
+        """
+        await self.cancelAnimation()
+        if not self.state or not self.brightness:
+            await self.setStateBuffered(False)
+            await self.sendPacketBuffer()
+            return
+        if self._resume_brightness is None:
+            #a cancelled fade out left a dimmed value, keep the original one
+            self._resume_brightness = self.brightness
+        self._animation_task = asyncio.create_task(
+            self._runTransition(duration, self.brightness, 0, self.color, None, power_off=True)
+        )
+
+    @property
+    def resume_brightness(self) -> float:
+        """ brightness the light returns to when powered on """
+        if self._resume_brightness is not None:
+            return self._resume_brightness
+        return self.brightness or 255
+
+    def _frameInterval(self, packets_per_frame: int) -> float:
+        """ returns the frame interval the link currently sustains """
+        return max(self._packet_delay * packets_per_frame, TRANSITION_MIN_FRAME_INTERVAL)
+
+    async def _runTransition(self, duration, start_brightness, brightness, start_color, color, power_off: bool = False):
+        """ streams interpolated frames paced to the link throughput """
+        loop = asyncio.get_running_loop()
+        current_brightness, current_color = start_brightness, start_color
+        powered_off = False
+        async with self._slot(PRIORITY_USER):
+            try:
+                await self._ensureConnected()
+                packets_per_frame = (1 if brightness is not None else 0) + (len(self._colorPackets(0, 0, 0)) if color else 0)
+                interval = self._frameInterval(packets_per_frame)
+                steps = max(1, int(duration / interval))
+                started = loop.time()
+                last_frame = None
+                for step in range(1, steps + 1):
+                    progress = step / steps
+                    packets = []
+                    if brightness is not None:
+                        current_brightness = start_brightness + (brightness - start_brightness) * progress
+                        packets.append(self._brightnessPacket(current_brightness))
+                    if color:
+                        current_color = tuple(round(a + (b - a) * progress) for a, b in zip(start_color, color))
+                        packets.extend(self._colorPackets(*current_color))
+                    #skip frames that quantize to what the device already shows
+                    frame = [bytes(packet.payload) for packet in packets]
+                    if frame != last_frame:
+                        last_frame = frame
+                        for packet in packets:
+                            #frames are encoded into one reused buffer while streaming
+                            await self._writeFrame(GoveeUtils.writeFrame(self._stream_frame, packet.head, packet.cmd, packet.payload))
+                    #drift corrected pacing
+                    delay = started + step * interval - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                #confirm the final values
+                if brightness is not None:
+                    await self._transmitPacket(self._brightnessPacket(brightness))
+                if color:
+                    for packet in self._colorPackets(*color):
+                        await self._transmitPacket(packet)
+                if power_off:
+                    powered_off = await self._transmitPacket(LedPacket(LedPacketHead.COMMAND, LedPacketCmd.POWER, [0x0]))
+            except Exception as e:
+                _LOGGER.warning(f"Transition on {self.address} failed: {e}")
+            finally:
+                #the state changed without answers, the next identical answer is news again
+                self._last_frames.clear()
+                if powered_off:
+                    self._expectations.pop("state", None)
+                    self.state = False
+                #reflect what the device shows now, even if the fade was cancelled
+                if brightness is not None:
+                    self._expectations.pop("brightness", None)
+                    self.brightness = current_brightness
+                if color:
+                    self._showColor(current_color)
+                self._conn.release(self._slotContended())
+                await self._update_callback()
     
+    async def startStream(self, frames: FrameRingBuffer):
+        """Drives the light from a host side frame stream until cancelled.
+
+        Frames are written over one held connection as fast as the link
+        sustains, frames arriving in the meantime are merged into the newest.
+        """
+        await self.cancelAnimation()
+        if not self.state:
+            await self.setStateBuffered(True)
+            await self.sendPacketBuffer()
+        self._animation_task = asyncio.create_task(self._runStream(frames))
+
+    async def _runStream(self, frames: FrameRingBuffer):
+        """ writes the newest buffered frame whenever the link is ready """
+        loop = asyncio.get_running_loop()
+        brightness = self.brightness
+        color = self.color if self._showsColor(self.color) else None
+        painted = False
+        async with self._slot(PRIORITY_USER):
+            try:
+                await self._ensureConnected()
+                while True:
+                    frame = await frames.next()
+                    packets = []
+                    if frame.brightness is not None and frame.brightness != brightness:
+                        brightness = frame.brightness
+                        packets.append(self._brightnessPacket(brightness))
+                    if frame.color is not None and frame.color != color:
+                        color, painted = frame.color, True
+                        packets.extend(self._colorPackets(*color))
+                    if not packets:
+                        continue
+                    started = loop.time()
+                    for packet in packets:
+                        await self._writeFrame(GoveeUtils.writeFrame(self._stream_frame, packet.head, packet.cmd, packet.payload))
+                    frames.stats.recordSent(frame.received)
+                    #hold the rate the link sustains, newer frames replace older ones meanwhile
+                    delay = started + self._frameInterval(len(packets)) - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+            except Exception as e:
+                _LOGGER.warning(f"Stream to {self.address} failed: {e}")
+            finally:
+                #reflect the last streamed frame
+                self._expectations.pop("brightness", None)
+                self.brightness = brightness
+                if painted:
+                    self._showColor(color)
+                self._conn.release(self._slotContended())
+                await self._update_callback()
+
+    def _framePackets(self, brightness: float | None, color: tuple[int, int, int] | None) -> list[LedPacket]:
+        """ returns the commands showing brightness and/or color """
+        packets = []
+        if brightness is not None:
+            packets.append(self._brightnessPacket(brightness))
+        if color is not None:
+            packets.extend(self._colorPackets(*color))
+        return packets
+
+    def _compileEffect(self, effect: EffectDefinition) -> CompiledEffect:
+        """ returns the schedule of an effect for the frame rate the link sustains """
+        packets_per_frame = len(self._framePackets(*effect.sample(0)))
+        #round up to whole minimum intervals so schedules can be reused
+        interval = math.ceil(self._frameInterval(packets_per_frame) / TRANSITION_MIN_FRAME_INTERVAL) * TRANSITION_MIN_FRAME_INTERVAL
+        key = (effect, interval)
+        if key not in self._compiled_effects:
+            self._compiled_effects[key] = compileEffect(effect, interval, self._framePackets)
+        return self._compiled_effects[key]
+
+    async def startSequence(self, effect: EffectDefinition):
+        """Plays a host side effect from its precompiled schedule.
+
+        The schedule is played over one held connection in the background,
+        any new user command cancels it.
+        """
+        await self.cancelAnimation()
+        compiled = self._compileEffect(effect)
+        if not self.state:
+            await self.setStateBuffered(True)
+            await self.sendPacketBuffer()
+        self._sequence_effect = effect.name
+        self._animation_task = asyncio.create_task(self._runSequence(compiled))
+
+    async def _runSequence(self, compiled: CompiledEffect):
+        """ writes the scheduled frames on time, skipping those already overdue """
+        loop = asyncio.get_running_loop()
+        schedule = compiled.schedule
+        shown = None
+        async with self._slot(PRIORITY_USER):
+            try:
+                await self._ensureConnected()
+                started = loop.time()
+                while True:
+                    for index, frame in enumerate(schedule):
+                        #drift corrected against the start of the iteration
+                        delay = started + frame.offset - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        elif index + 1 < len(schedule) and started + schedule[index + 1].offset <= loop.time():
+                            continue
+                        for data in frame.frames:
+                            await self._writeFrame(data)
+                        shown = frame
+                    if not compiled.loop:
+                        break
+                    started += compiled.duration
+            except Exception as e:
+                _LOGGER.warning(f"Effect {compiled.name} on {self.address} failed: {e}")
+            finally:
+                self._sequence_effect = None
+                if shown is not None:
+                    if shown.brightness is not None:
+                        self._expectations.pop("brightness", None)
+                        self.brightness = shown.brightness
+                    if shown.color is not None:
+                        self._showColor(shown.color)
+                self._conn.release(self._slotContended())
+                await self._update_callback()
+
     async def setEffectBuffered(self, effect_name: str):
         """ adds the effect/music mode to the transmit buffer """
         if effect_name not in EFFECT_MAP:
             _LOGGER.warning(f"Unknown effect: {effect_name}")
             return None
             
-        if self.current_effect == effect_name:
+        if self._shows("effect", effect_name):
             return None  # nothing to do
             
+        packet = self._effectPacket(effect_name)
+        await self._preparePacket(packet.cmd, packet.payload)
+        await self.requestMusicModeBuffered()
+        self._expect("effect", effect_name)
+    
+    def _effectPacket(self, effect_name: str) -> LedPacket:
+        """ returns the command selecting a built-in effect """
         effect_value = EFFECT_MAP[effect_name]
-        
         # Determine which command to use based on effect type
         if isinstance(effect_value, MusicModeType):
-            await self._preparePacket(LedPacketCmd.MUSIC_MODE, [effect_value])
-        elif isinstance(effect_value, (CarnivalModeType, BasicModeType)):
-            await self._preparePacket(LedPacketCmd.EFFECT, [effect_value])
-        
-        await self.requestMusicModeBuffered()
-    
-    async def reset_connection_state(self):
-        """Reset connection state and failure counters."""
-        async with self._connection_lock:
-            self._connection_failures = 0
-            self._last_connection_attempt = 0
-            await self._cleanup_connection()
-            _LOGGER.info(f"Reset connection state for {self.address}")
-    
-    @property
-    def connection_failures(self):
-        """Get the current number of connection failures."""
-        return self._connection_failures
-    
-    @property
-    def is_connected(self):
-        """Check if the device is currently connected."""
-        return self._client and self._client.is_connected
-    
+            return LedPacket(LedPacketHead.COMMAND, LedPacketCmd.MUSIC_MODE, [effect_value])
+        return LedPacket(LedPacketHead.COMMAND, LedPacketCmd.EFFECT, [effect_value])
+
     async def setMusicModeBuffered(self, enabled: bool):
         """ enables or disables music mode """
-        if self.music_mode_enabled == enabled:
+        if "effect" in self._field_updated and self.music_mode_enabled == enabled:
             return None  # nothing to do
             
         if enabled:
@@ -364,18 +1469,40 @@ class GoveeAPI:
     
     async def reset_connection_state(self):
         """Reset connection state and failure counters."""
-        async with self._connection_lock:
-            self._connection_failures = 0
-            self._last_connection_attempt = 0
-            await self._cleanup_connection()
-            _LOGGER.info(f"Reset connection state for {self.address}")
-    
+        await self.cancelAnimation()
+        await self._conn.reset()
+
+    async def _keepAlive(self):
+        """ pings the device to keep the connection open """
+        await self.requestSnapshot({"state"})
+
     @property
     def connection_failures(self):
         """Get the current number of connection failures."""
-        return self._connection_failures
-    
+        return self._conn.connection_failures
+
     @property
     def is_connected(self):
         """Check if the device is currently connected."""
-        return self._client and self._client.is_connected
+        return self._conn.is_connected
+
+    @property
+    def metrics(self) -> DeviceMetrics:
+        return self._conn.metrics
+
+    @property
+    def source(self) -> str:
+        return self._conn.source
+
+    @property
+    def paths(self) -> PathSelector:
+        return self._conn.paths
+
+    @property
+    def circuit(self) -> CircuitBreaker:
+        return self._conn.breaker
+
+    @property
+    def connection_stats(self) -> ConnectionStats:
+        """Get the connection reuse statistics."""
+        return self._conn.stats
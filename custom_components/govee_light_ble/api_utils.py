@@ -83,7 +83,28 @@ EFFECT_MAP = {
     "Calm": BasicModeType.CALM,
 }
 
+# Effect names by mode value, the values of all effect types are distinct
+EFFECT_NAMES = {value: name for name, value in EFFECT_MAP.items()}
+
+# State carried in advertisements: manufacturer id -> {field: payload offset}
+# Lights that broadcast their power state do so in the manufacturer data of
+# company id 0x8802, other fields are only available over a connection.
+ADVERTISEMENT_LAYOUTS = {
+    0x8802: {"state": 4},
+}
+
 @dataclass
+class GoveeApiData:
+    """Class to hold api data."""
+
+    state: bool | None = None
+    brightness: int | None = None
+    color: tuple[int, ...] | None = None
+    current_effect: str | None = None
+    music_mode_enabled: bool = False
+    segments: tuple[tuple[int, int, int] | None, ...] | None = None
+
+@dataclass(slots=True)
 class LedPacket:
     #request data or perform a change
     head: LedPacketHead
@@ -92,31 +113,111 @@ class LedPacket:
     #actual data to transmit
     payload: bytes | list = b''
 
+FRAME_LENGTH = 20
+_ZERO_FRAME = bytes(FRAME_LENGTH)
+#scratch buffer for frames that are copied out right away
+_SCRATCH_FRAME = bytearray(FRAME_LENGTH)
+#complete query frames, there are only a handful of distinct ones
+_FRAME_CACHE: dict[tuple[int, bytes], bytes] = {}
+
 class GoveeUtils:
     @staticmethod
-    async def generateChecksum(frame: bytes):
+    def coalesceKey(packet: LedPacket):
+        """ returns the key under which a queued packet is superseded by a newer one """
+        payload = bytes(packet.payload)
+        if packet.head == LedPacketHead.COMMAND and packet.cmd == LedPacketCmd.COLOR:
+            #legacy devices need both color types, segment colors are keyed by their segment mask
+            if payload[:1] == bytes([LedColorType.SEGMENTS]):
+                return (packet.head, packet.cmd, payload[:1] + payload[10:12])
+            return (packet.head, packet.cmd, payload[:1])
+        if packet.cmd == LedPacketCmd.SEGMENT:
+            #one entry per requested segment
+            return (packet.head, packet.cmd, payload[:1])
+        return (packet.head, packet.cmd, b'')
+
+    @staticmethod
+    def segmentMask(packet: LedPacket) -> int | None:
+        """ returns the segment mask of a segment color command """
+        payload = bytes(packet.payload)
+        if packet.head != LedPacketHead.COMMAND or packet.cmd != LedPacketCmd.COLOR:
+            return None
+        if payload[:1] != bytes([LedColorType.SEGMENTS]) or len(payload) < 12:
+            return None
+        return payload[10] | payload[11] << 8
+
+    @staticmethod
+    def ackKey(head: int, cmd: int, payload: bytes | list = b''):
+        """ returns the key matching a sent packet to the frame the device answers with """
+        if cmd == LedPacketCmd.SEGMENT:
+            #segment responses echo the requested group
+            return (head, cmd & 0xFF, bytes(payload[:1]))
+        return (head, cmd & 0xFF)
+
+    @staticmethod
+    def generateChecksum(frame) -> int:
         """ returns checksum by XORing all data bytes """
         checksum = 0
         for b in frame:
             checksum ^= b
         #pad response to 8 bits
-        return bytes([checksum & 0xFF])
+        return checksum & 0xFF
 
     @staticmethod
-    async def generateFrame(packet: LedPacket):
-        """ returns transmittable frame bytes """
+    def writeFrame(buffer: bytearray, head: int, cmd: int, payload: bytes | list = b'') -> bytearray:
+        """ writes a complete frame into a preallocated FRAME_LENGTH buffer """
         #pad cmd to 8 bits
-        cmd = packet.cmd & 0xFF
-        #combine segments
-        frame = bytes([packet.head, cmd]) + bytes(packet.payload)
+        cmd &= 0xFF
         #pad frame data to 19 bytes (plus checksum)
-        frame += bytes([0] * (19 - len(frame)))
-        #add checksum to end
-        frame += await GoveeUtils.generateChecksum(frame)
+        buffer[:] = _ZERO_FRAME
+        buffer[0] = head
+        buffer[1] = cmd
+        buffer[2:2 + len(payload)] = payload
+        #checksum over head, cmd and payload, the padding does not change it
+        checksum = head ^ cmd
+        for b in payload:
+            checksum ^= b
+        buffer[FRAME_LENGTH - 1] = checksum & 0xFF
+        return buffer
+
+    @staticmethod
+    def generateFrame(packet: LedPacket) -> bytes:
+        """ returns transmittable frame bytes, query frames are built once and cached """
+        cacheable = packet.head == LedPacketHead.REQUEST
+        if cacheable:
+            key = (packet.cmd, bytes(packet.payload))
+            frame = _FRAME_CACHE.get(key)
+            if frame is not None:
+                return frame
+        frame = bytes(GoveeUtils.writeFrame(_SCRATCH_FRAME, packet.head, packet.cmd, packet.payload))
+        if cacheable:
+            _FRAME_CACHE[key] = frame
         return frame
 
     @staticmethod
-    async def verifyChecksum(frame: bytes):
-        checksum_received = frame[-1].to_bytes(1, 'big')
-        checksum_calculated = await GoveeUtils.generateChecksum(frame[:-1])
-        return checksum_received == checksum_calculated
+    def verifyChecksum(frame: bytes) -> bool:
+        checksum = 0
+        for index in range(len(frame) - 1):
+            checksum ^= frame[index]
+        return frame[-1] == checksum
+
+    @staticmethod
+    def effectName(mode_value: int) -> str | None:
+        """ returns the effect name of a mode value, None when no effect runs """
+        if mode_value == 0x00:
+            return None
+        return EFFECT_NAMES.get(mode_value, f"Unknown_{mode_value:02x}")
+
+    @staticmethod
+    def decodeAdvertisement(manufacturer_data: dict[int, bytes]) -> dict:
+        """ returns the state fields carried in the manufacturer data of an advertisement """
+        fields = {}
+        for manufacturer_id, layout in ADVERTISEMENT_LAYOUTS.items():
+            data = manufacturer_data.get(manufacturer_id)
+            if not data:
+                continue
+            for field, offset in layout.items():
+                if offset >= len(data):
+                    continue
+                if field == "state":
+                    fields["state"] = data[offset] == 0x01
+        return fields
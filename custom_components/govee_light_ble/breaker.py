@@ -0,0 +1,121 @@
+"""Per device circuit breaker and link health."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from enum import StrEnum
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_OPEN_MIN,
+    BREAKER_OPEN_MAX,
+    HEALTH_WINDOW,
+    RSSI_UNUSABLE,
+    RSSI_EXCELLENT
+)
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"  # connecting normally
+    OPEN = "open"  # failing fast until the open period ends
+    HALF_OPEN = "half_open"  # one trial connection decides
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of connecting while a device is known to be unreachable."""
+
+    def __init__(self, address: str, retry_in: float):
+        super().__init__(f"{address} is unreachable, next connection attempt in {retry_in:.0f}s")
+        self.address = address
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Stops connection attempts to a failing device, retrying after growing pauses."""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.state = CircuitState.CLOSED
+        #consecutive failed connection attempts
+        self.failures = 0
+        #consecutive times the circuit opened, grows the open period
+        self._trips = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        #outcome of the recent connection attempts
+        self._outcomes: deque[bool] = deque(maxlen=HEALTH_WINDOW)
+        self.rssi: int | None = None
+
+    @property
+    def open_period(self) -> float:
+        return min(BREAKER_OPEN_MIN * 2 ** max(self._trips - 1, 0), BREAKER_OPEN_MAX)
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next connection attempt is allowed."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(self._opened_at + self.open_period - time.monotonic(), 0.0)
+
+    @property
+    def rejecting(self) -> bool:
+        """True while attempts are refused, cheap enough to check before any work."""
+        if self.state == CircuitState.OPEN:
+            return self.retry_in > 0
+        return self.state == CircuitState.HALF_OPEN and self._trial_running
+
+    def allow(self) -> bool:
+        """Decides whether a connection attempt may start now."""
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.rejecting:
+            return False
+        if self.state == CircuitState.OPEN:
+            self.state = CircuitState.HALF_OPEN
+            _LOGGER.debug(f"Circuit for {self.address} half open, trying to connect")
+        self._trial_running = True
+        return True
+
+    def record_success(self):
+        self._outcomes.append(True)
+        if self.state != CircuitState.CLOSED:
+            _LOGGER.info(f"{self.address} is reachable again, circuit closed")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._trips = 0
+        self._trial_running = False
+
+    def record_failure(self):
+        self._outcomes.append(False)
+        self.failures += 1
+        self._trial_running = False
+        if self.state == CircuitState.HALF_OPEN or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            self._trips += 1
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            _LOGGER.warning(
+                f"{self.address} failed {self.failures} connection attempt(s), "
+                f"not connecting for {self.open_period:.0f}s"
+            )
+
+    def cancel_trial(self):
+        """ forgets an attempt that was aborted before it could fail or succeed """
+        self._trial_running = False
+
+    def reset(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._trips = 0
+        self._trial_running = False
+
+    @property
+    def health(self) -> int:
+        """Score from 0 to 100, weighing connection success rate and signal strength."""
+        success_rate = sum(self._outcomes) / len(self._outcomes) if self._outcomes else 1.0
+        if self.rssi is None:
+            return round(success_rate * 100)
+        signal = min(max((self.rssi - RSSI_UNUSABLE) / (RSSI_EXCELLENT - RSSI_UNUSABLE), 0.0), 1.0)
+        return round((success_rate * 0.7 + signal * 0.3) * 100)
@@ -8,12 +8,25 @@ from homeassistant.components.bluetooth import (
     BluetoothServiceInfoBleak,
     async_discovered_service_info,
 )
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import CONF_ADDRESS, CONF_NAME, CONF_TYPE
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.selector import selector
 
-from .const import DOMAIN, DISCOVERY_NAMES
+from .const import (
+    DOMAIN,
+    DISCOVERY_NAMES,
+    CONF_CONNECTION_POLICY,
+    CONF_IDLE_TIMEOUT,
+    CONNECTION_POLICIES,
+    DEFAULT_CONNECTION_POLICY,
+    DEFAULT_IDLE_TIMEOUT,
+    CONF_PASSIVE_UPDATES,
+    DEFAULT_PASSIVE_UPDATES,
+    CONF_OPTIMISTIC,
+    DEFAULT_OPTIMISTIC
+)
 
 
 class GoveeConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -25,6 +38,12 @@ class GoveeConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovered_device: None = None
         self._discovered_devices: dict[str, str] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return GoveeOptionsFlow(config_entry)
+
     #dicover device
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
@@ -95,3 +114,39 @@ class GoveeConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Required("segmented", default=True): bool,
                 vol.Required("music_mode_support", default=is_h1167): bool
             }))
+
+
+class GoveeOptionsFlow(OptionsFlow):
+    """Handle connection options."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the connection policy."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init", data_schema=vol.Schema({
+                vol.Required(
+                    CONF_CONNECTION_POLICY,
+                    default=options.get(CONF_CONNECTION_POLICY, DEFAULT_CONNECTION_POLICY)
+                ): vol.In(CONNECTION_POLICIES),
+                vol.Required(
+                    CONF_IDLE_TIMEOUT,
+                    default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=600)),
+                vol.Required(
+                    CONF_PASSIVE_UPDATES,
+                    default=options.get(CONF_PASSIVE_UPDATES, DEFAULT_PASSIVE_UPDATES)
+                ): bool,
+                vol.Required(
+                    CONF_OPTIMISTIC,
+                    default=options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC)
+                ): bool
+            }))
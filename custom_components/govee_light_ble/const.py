@@ -1,11 +1,110 @@
 DOMAIN = "govee_light_ble"
+DATA_SCHEDULER = "scheduler"  # hass.data[DOMAIN] key of the shared connection scheduler
+DATA_EFFECTS = "effects"  # hass.data[DOMAIN] key of the effects configured in YAML
+DATA_SCENES = "scenes"  # hass.data[DOMAIN] key of the captured scene snapshots
+DATA_STORE = "store"  # hass.data[DOMAIN] key of the persisted light states
+DATA_STARTUP_QUEUE = "startup_queue"  # hass.data[DOMAIN] key counting deferred first polls
+
+# YAML configuration
+CONF_EFFECTS = "effects"
+CONF_KEYFRAMES = "keyframes"
+CONF_LOOP = "loop"
+CONF_TIME = "time"
+CONF_EASING = "easing"
+
+# Services
+SERVICE_SET_SEGMENT_COLORS = "set_segment_colors"
+SERVICE_SET_GROUP = "set_group"
+SERVICE_START_STREAM = "start_stream"
+SERVICE_STOP_STREAM = "stop_stream"
+SERVICE_SNAPSHOT_SCENE = "snapshot_scene"
+SERVICE_RESTORE_SCENE = "restore_scene"
+SERVICE_BULK_APPLY = "bulk_apply"
+ATTR_SCENE_ID = "scene_id"
+ATTR_PORT = "port"
+ATTR_HOST = "host"
+ATTR_EVENT_TYPE = "event_type"
+ATTR_TARGETS = "targets"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_COLORS = "colors"
+ATTR_STATE = "state"
 DISCOVERY_NAMES = ('Govee_', 'ihoment_', 'GBK_', 'H1167', 'H1167_')
 READ_CHARACTERISTIC_UUID = '00010203-0405-0607-0809-0a0b0c0d2b10'
 WRITE_CHARACTERISTIC_UUID = '00010203-0405-0607-0809-0a0b0c0d2b11'
 
 # Connection settings
 MAX_CONNECTION_ATTEMPTS = 3
-CONNECTION_TIMEOUT = 10  # Reduced from 30 to 10 seconds
-RETRY_DELAY = 1  # Reduced from 2 to 1 second
-INITIAL_CONNECTION_TIMEOUT = 15  # Longer timeout for initial connection
-RECONNECTION_TIMEOUT = 8  # Shorter timeout for reconnections
+MAX_CONNECTIONS_PER_ADAPTER = 3  # Concurrent connections per local adapter or proxy
+SLOT_WAIT_TIMEOUT = 10  # Seconds a new connection waits for a slot of its adapter or proxy
+BULK_CONCURRENCY = 10  # Lights a bulk update works on at the same time, across all adapters
+
+# Circuit breaker settings
+BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failed connects before a device is given up on for a while
+BREAKER_OPEN_MIN = 30  # Seconds without connection attempts after the circuit opens
+BREAKER_OPEN_MAX = 600  # Upper bound of the growing open period
+HEALTH_WINDOW = 20  # Recent connection attempts the health score is based on
+RSSI_UNUSABLE = -100  # Signal strength scored as 0
+RSSI_EXCELLENT = -60  # Signal strength scored as 100
+PATH_SWITCH_MARGIN = 0.1  # Score advantage another adapter or proxy needs before connections move to it
+
+# Packet transmission settings
+PACKET_RETRY_LIMIT = 2  # Retransmissions for packets that were not acknowledged
+COMMAND_RETRY_LIMIT = 2  # Further bursts a user command gets after the connection failed
+COMMAND_RETRY_DELAY = 0.5  # Seconds before the first command retry, doubled for each further one
+PACKET_DELAY_MIN = 0.005  # Lower bound of the adaptive inter-packet delay
+PACKET_DELAY_MAX = 0.1  # Upper bound of the adaptive inter-packet delay
+PACKET_PACING_FACTOR = 2  # Inter-packet delay as a multiple of the observed write time
+ACK_TIMEOUT = 0.5  # Seconds to wait for the device to echo a packet
+SNAPSHOT_TIMEOUT = 2.0  # Seconds to wait for all responses of a state snapshot
+DUPLICATE_WINDOW = 1.0  # Seconds in which an identical response is treated as a repeated echo
+TRANSITION_MIN_FRAME_INTERVAL = 0.05  # Shortest time between two transition frames
+
+# Connection policy settings
+CONF_CONNECTION_POLICY = "connection_policy"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONNECTION_POLICY_ALWAYS = "always_connected"  # Keep the link open with keep-alive pings
+CONNECTION_POLICY_IDLE = "idle_timeout"  # Release the slot after a period without traffic
+CONNECTION_POLICY_BURST = "per_burst"  # Release the slot after every burst of commands
+CONNECTION_POLICIES = [CONNECTION_POLICY_ALWAYS, CONNECTION_POLICY_IDLE, CONNECTION_POLICY_BURST]
+DEFAULT_CONNECTION_POLICY = CONNECTION_POLICY_IDLE
+DEFAULT_IDLE_TIMEOUT = 30  # Seconds without traffic before the slot is released
+KEEP_ALIVE_INTERVAL = 20  # Seconds between keep-alive pings on an idle connection
+
+# Passive update settings
+CONF_PASSIVE_UPDATES = "passive_updates"
+DEFAULT_PASSIVE_UPDATES = False
+UPDATE_INTERVAL = 15  # Seconds between active polls
+PASSIVE_FALLBACK_INTERVAL = 300  # Seconds between fallback polls when advertisements carry state
+STATE_MAX_AGE = 900  # Seconds after which a passively known value is refreshed over a connection
+
+# Optimistic update settings
+CONF_OPTIMISTIC = "optimistic"
+DEFAULT_OPTIMISTIC = False
+OPTIMISTIC_TIMEOUT = 10  # Seconds an optimistic value may stay unconfirmed before it is rolled back
+
+# Startup settings
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10  # Seconds state changes are collected before they are written
+STARTUP_POLL_DELAY = 10  # Seconds before the first poll of a light restored from storage
+STARTUP_POLL_STAGGER = 1  # Seconds between the first polls of consecutive lights
+
+# Adaptive polling settings
+FAST_POLL_INTERVAL = 5  # Seconds between polls right after a change
+FAST_POLL_WINDOW = 60  # Seconds the fast interval is kept after a change
+MAX_POLL_INTERVAL = 600  # Upper bound when backing off a stable or unreachable light
+PUSH_DEBOUNCE = 0.2  # Seconds in which pushed state changes are coalesced into one update
+
+# Streaming settings
+STREAM_EVENT_TYPE = "govee_light_ble_stream_frame"  # Default event carrying stream frames
+STREAM_DEFAULT_HOST = "127.0.0.1"  # Address the UDP stream socket listens on unless another is given
+STREAM_BUFFER_SIZE = 4  # Frames kept for the consumer, older ones are overwritten
+STREAM_MAX_FRAME_AGE = 0.5  # Seconds after which a buffered frame is stale and skipped
+STREAM_STATS_WINDOW = 1.0  # Seconds over which the achieved frame rate is measured
+
+# Metrics settings
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # Histogram bucket bounds in seconds
+
+# Segment settings
+SEGMENT_COUNT = 15  # Segments addressable through the 16 bit segment mask
+SEGMENTS_PER_GROUP = 4  # Segments reported per segment query response
+SEGMENT_GROUPS = -(-SEGMENT_COUNT // SEGMENTS_PER_GROUP)  # Queries needed to read all segments
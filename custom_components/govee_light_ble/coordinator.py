@@ -1,34 +1,67 @@
-from dataclasses import dataclass
+import time
 from datetime import timedelta
 
+from bleak import BLEDevice
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.components.light import ATTR_BRIGHTNESS, ATTR_RGB_COLOR
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.components import bluetooth
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak
+)
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    DATA_EFFECTS,
+    CONF_CONNECTION_POLICY,
+    CONF_IDLE_TIMEOUT,
+    DEFAULT_CONNECTION_POLICY,
+    DEFAULT_IDLE_TIMEOUT,
+    CONF_PASSIVE_UPDATES,
+    DEFAULT_PASSIVE_UPDATES,
+    CONF_OPTIMISTIC,
+    DEFAULT_OPTIMISTIC,
+    UPDATE_INTERVAL,
+    PASSIVE_FALLBACK_INTERVAL,
+    STATE_MAX_AGE,
+    FAST_POLL_INTERVAL,
+    FAST_POLL_WINDOW,
+    MAX_POLL_INTERVAL,
+    PUSH_DEBOUNCE,
+    STREAM_STATS_WINDOW,
+    STREAM_DEFAULT_HOST
+)
 from .api import GoveeAPI
+from .api_utils import GoveeApiData, GoveeUtils
+from .scheduler import GoveeConnectionScheduler, PRIORITY_POLL
+from .sequencer import EffectDefinition
+from .stream import FrameRingBuffer, StreamStats, UdpFrameProtocol
+from .metrics import DeviceMetrics
+from .paths import PathCandidate
 
 import logging
 _LOGGER = logging.getLogger(__name__)
 
-@dataclass
-class GoveeApiData:
-    """Class to hold api data."""
-
-    state: bool | None = None
-    brightness: int | None = None
-    color: tuple[int, ...] | None = None
-    current_effect: str | None = None
-    music_mode_enabled: bool = False
-
 class GoveeCoordinator(DataUpdateCoordinator):
     """My coordinator."""
 
     data: GoveeApiData
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        ble_device: BLEDevice,
+        scheduler: GoveeConnectionScheduler | None = None
+    ) -> None:
         """Initialize coordinator."""
 
         # Set variables from values entered in config flow setup
@@ -37,21 +70,34 @@ class GoveeCoordinator(DataUpdateCoordinator):
         self.device_segmented = config_entry.data["segmented"]
         self.is_h1167 = config_entry.data.get("is_h1167", False)
         self.music_mode_support = config_entry.data.get("music_mode_support", False)
+        self.passive_updates = config_entry.options.get(CONF_PASSIVE_UPDATES, DEFAULT_PASSIVE_UPDATES)
+        self.optimistic = config_entry.options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC)
+        # Host side effects configured in YAML, played by the sequencer
+        self.effects: dict[str, EffectDefinition] = hass.data.get(DOMAIN, {}).get(DATA_EFFECTS, {})
+
+        self._scheduler = scheduler
 
-        # Get connection to bluetooth device
-        # Note: connectable should be True for devices we want to connect to
-        ble_device = bluetooth.async_ble_device_from_address(
-            hass,
-            self.device_address,
-            connectable=True  # Changed from False to True for proper connection
-        )
-        
-        if not ble_device:
-            _LOGGER.error(f"Could not find BLE device with address {self.device_address}")
-            raise ValueError(f"BLE device {self.device_address} not found")
-            
         _LOGGER.info(f"Initializing Govee device: {self.device_name} ({self.device_address})")
-        self._api = GoveeAPI(ble_device, self._async_push_data, self.device_segmented)
+        self._api = GoveeAPI(
+            ble_device,
+            self._async_push_data,
+            self.device_segmented,
+            connection_policy=config_entry.options.get(CONF_CONNECTION_POLICY, DEFAULT_CONNECTION_POLICY),
+            idle_timeout=config_entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+            scheduler=scheduler,
+            optimistic=self.optimistic,
+            path_resolver=self._async_connection_paths
+        )
+
+        # Set when the first poll was moved out of startup, see restore_cached
+        self._deferred_first_poll = False
+        self.startup_time_saved: float | None = None
+
+        # Advertisements push state in passive mode, polling is only a fallback then
+        self._base_interval = PASSIVE_FALLBACK_INTERVAL if self.passive_updates else UPDATE_INTERVAL
+        # Adaptive polling state
+        self._fast_poll_until = 0.0
+        self._stable_polls = 0
 
         # Initialise DataUpdateCoordinator
         super().__init__(
@@ -60,45 +106,160 @@ class GoveeCoordinator(DataUpdateCoordinator):
             name=f"{DOMAIN} ({config_entry.unique_id})",
             # Set update method to get devices on first load.
             update_method=self._async_update_data,
-            # Do not set a polling interval as data will be pushed.
-            # You can remove this line but left here for explanatory purposes.
-            update_interval=timedelta(seconds=15)
+            # Adapted after every poll, see _adapt_interval
+            update_interval=timedelta(seconds=self._base_interval)
         )
 
-    def _get_data(self):
-        return GoveeApiData(
-            state=self._api.state,
-            brightness=self._api.brightness,
-            color=self._api.color,
-            current_effect=self._api.current_effect,
-            music_mode_enabled=self._api.music_mode_enabled
+        # Active frame stream and the callbacks closing its source
+        self._stream: FrameRingBuffer | None = None
+        self._stream_unsubs: list[CALLBACK_TYPE] = []
+
+        # Notifications arrive in bursts, publish them as one state write
+        self._push_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=PUSH_DEBOUNCE,
+            immediate=False,
+            function=self._async_publish
         )
 
-    async def _async_push_data(self):
+        if self.passive_updates:
+            config_entry.async_on_unload(
+                bluetooth.async_register_callback(
+                    hass,
+                    self._async_handle_advertisement,
+                    BluetoothCallbackMatcher(address=self.device_address),
+                    BluetoothScanningMode.PASSIVE
+                )
+            )
+
+    @callback
+    def _async_handle_advertisement(self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange) -> None:
+        """Apply state carried in the advertisement without connecting."""
+        self._api.circuit.rssi = service_info.rssi
+        fields = GoveeUtils.decodeAdvertisement(service_info.manufacturer_data)
+        if fields and self._api.applyAdvertisement(fields):
+            _LOGGER.debug(f"Advertisement from {self.device_name} updated {', '.join(fields)}")
+            self._async_publish()
+
+    @callback
+    def _async_connection_paths(self) -> list[PathCandidate]:
+        """Scanners that can connect to the light, with their signal and free slots."""
+        candidates = []
+        for scanner_device in bluetooth.async_scanner_devices_by_address(self.hass, self.device_address, connectable=True):
+            source = scanner_device.scanner.source
+            free_slots = self._scheduler.free_slots(source) if self._scheduler else None
+            if hasattr(bluetooth, "async_current_allocations"):
+                # Slots the adapter or proxy itself reports, shared with other integrations
+                allocations = bluetooth.async_current_allocations(self.hass, source)
+                if allocations:
+                    free_slots = allocations[0].free if free_slots is None else min(free_slots, allocations[0].free)
+            candidates.append(PathCandidate(
+                scanner_device.ble_device,
+                source,
+                scanner_device.advertisement.rssi,
+                free_slots
+            ))
+        return candidates
+
+    @callback
+    def restore_cached(self, data: GoveeApiData, delay: float):
+        """Publish a persisted state and poll the device only after delay seconds."""
+        self._api.applyCached(data)
+        self._deferred_first_poll = True
+        self.update_interval = timedelta(seconds=delay)
         self.async_set_updated_data(self._get_data())
 
+    def _boost_polling(self):
+        """Poll quickly for a while after a change."""
+        self._fast_poll_until = time.monotonic() + FAST_POLL_WINDOW
+        self._stable_polls = 0
+        self.update_interval = timedelta(seconds=FAST_POLL_INTERVAL)
+
+    def _adapt_interval(self, changed: bool):
+        """Choose the next poll interval from recent changes and link health."""
+        if changed:
+            # Changed without a command from us, someone else is using the light
+            self._boost_polling()
+            return
+        if time.monotonic() < self._fast_poll_until:
+            return
+        failures = self._api.connection_failures
+        if failures:
+            interval = self._base_interval * 2 ** failures
+        else:
+            self._stable_polls += 1
+            interval = self._base_interval * 2 ** (self._stable_polls - 1)
+        self.update_interval = timedelta(seconds=min(interval, MAX_POLL_INTERVAL))
+
+    @property
+    def poll_interval(self) -> float:
+        """Current interval between polls in seconds."""
+        return self.update_interval.total_seconds()
+
+    def _get_data(self) -> GoveeApiData:
+        return self._api.snapshot()
+
+    async def _async_push_data(self):
+        """Called for every decoded notification."""
+        if self._get_data() == self.data:
+            # Nothing new for Home Assistant
+            return
+        await self._push_debouncer.async_call()
+
+    @callback
+    def _async_publish(self):
+        """Publish the current state if it differs from the last published one."""
+        data = self._get_data()
+        if data != self.data:
+            self.async_set_updated_data(data)
+
     async def _async_update_data(self):
         """Fetch data from API endpoint with improved error handling.
 
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        previous = self.data
+        started = time.monotonic()
+        data = await self._async_poll()
+        if self._deferred_first_poll:
+            # Time the setup would otherwise have waited for
+            self._deferred_first_poll = False
+            self.startup_time_saved = time.monotonic() - started
+            _LOGGER.info(f"Deferred first poll of {self.device_name} took {self.startup_time_saved:.2f}s outside of startup")
+        self._adapt_interval(previous is not None and data != previous)
+        return data
+
+    async def _async_poll(self):
+        """Request the state fields that need refreshing."""
+        service_info = bluetooth.async_last_service_info(self.hass, self.device_address, connectable=True)
+        if service_info:
+            self._api.circuit.rssi = service_info.rssi
+        if self._api.circuit.rejecting:
+            # Known to be unreachable, keep the last state without touching the radio
+            return self._get_data()
+        if self._api.animating:
+            # The running fade, stream or effect owns the light, its frames define the state
+            return self._get_data()
         try:
-            await self._api.requestStateBuffered()
-            await self._api.requestBrightnessBuffered()
-            await self._api.requestColorBuffered()
-            
-            # Only request music mode for devices that support it
-            if self.music_mode_support:
-                await self._api.requestMusicModeBuffered()
-                
-            await self._api.sendPacketBuffer()
+            # In passive mode only values that advertisements did not refresh are polled
+            stale = self._api.staleFields(STATE_MAX_AGE if self.passive_updates else 0, self.music_mode_support)
+            if not stale:
+                return self._get_data()
+
+            # One pipelined query per field, answers are awaited together
+            started = time.monotonic()
+            data, unanswered = await self._api.requestSnapshot(stale, priority=PRIORITY_POLL)
+            self.metrics.poll_duration.observe(time.monotonic() - started)
+            if unanswered:
+                _LOGGER.debug(f"{self.device_name} did not report {', '.join(sorted(unanswered))}, keeping last known values")
             
             # Log successful update if we had previous failures
             if self._api.connection_failures > 0:
                 _LOGGER.info(f"Successfully updated {self.device_name} after previous connection issues")
                 
-            return self._get_data()
+            return data
             
         except Exception as e:
             _LOGGER.warning(
@@ -118,26 +279,186 @@ class GoveeCoordinator(DataUpdateCoordinator):
     async def setColorBuffered(self, red: int, green: int, blue: int):
         await self._api.setColorBuffered(red, green, blue)
 
-    async def sendPacketBuffer(self):
-        await self._api.sendPacketBuffer()
+    async def prime(self):
+        await self._api.prime()
+
+    async def setSegmentColorsBuffered(self, colors: list[tuple[int, int, int] | None]):
+        await self._api.setSegmentColorsBuffered(colors)
+
+    async def sendPacketBuffer(self) -> bool:
+        # A user command replaces a running stream
+        await self.stopStream()
+        if self.optimistic:
+            # Show the commanded state now, the device confirms or rolls it back later
+            self._async_publish()
+        result = await self._api.sendPacketBuffer()
+        # Follow up quickly on user commands, then back off again
+        self._boost_polling()
+        self._schedule_refresh()
+        return result
     
+    async def startTransition(self, duration: float, brightness: float | None = None, color: tuple[int, int, int] | None = None):
+        await self.stopStream()
+        await self._api.startTransition(duration, brightness, color)
+        self._boost_polling()
+        self._schedule_refresh()
+
+    async def startFadeOut(self, duration: float):
+        await self.stopStream()
+        await self._api.startFadeOut(duration)
+        self._boost_polling()
+        self._schedule_refresh()
+
+    @property
+    def resume_brightness(self) -> float:
+        """Brightness the light returns to when turned on, 0-255."""
+        return self._api.resume_brightness
+
     async def setEffectBuffered(self, effect_name: str):
         await self._api.setEffectBuffered(effect_name)
+
+    async def startSequence(self, effect_name: str):
+        await self.stopStream()
+        await self._api.startSequence(self.effects[effect_name])
+        self._async_publish()
     
     async def setMusicModeBuffered(self, enabled: bool):
         await self._api.setMusicModeBuffered(enabled)
+
+    async def async_snapshot(self) -> GoveeApiData:
+        """Capture the full state, reading the segments first if they are unknown."""
+        if self.device_segmented and self._api.segments is None:
+            await self._api.requestSnapshot({"segments"}, priority=PRIORITY_POLL)
+        return self._get_data()
+
+    async def async_restore(self, data: GoveeApiData) -> bool:
+        """Apply a captured state in one minimal burst."""
+        await self.stopStream()
+        result = await self._api.restoreState(data)
+        self._async_publish()
+        return result
+
+    def restore_frames(self, data: GoveeApiData) -> int:
+        """Commands async_restore would send for data, 0 if the light already shows it."""
+        return self._api.restoreFrames(data)
+
+    async def startStream(self, entity_id: str, port: int | None = None, event_type: str | None = None, host: str = STREAM_DEFAULT_HOST):
+        """Stream frames from a local UDP port and/or an event to the light.
+
+        The socket only listens on the loopback interface unless another host
+        address is given, frames are not authenticated.
+        """
+        await self.stopStream()
+        frames = FrameRingBuffer()
+
+        if port is not None:
+            transport, _ = await self.hass.loop.create_datagram_endpoint(
+                lambda: UdpFrameProtocol(frames), local_addr=(host, port)
+            )
+            self._stream_unsubs.append(transport.close)
+
+        if event_type is not None:
+            @callback
+            def _async_handle_frame(event: Event) -> None:
+                targets = event.data.get(ATTR_ENTITY_ID)
+                if targets and entity_id not in ([targets] if isinstance(targets, str) else targets):
+                    return
+                color = event.data.get(ATTR_RGB_COLOR)
+                frames.push(event.data.get(ATTR_BRIGHTNESS), tuple(color) if color else None)
+
+            self._stream_unsubs.append(self.hass.bus.async_listen(event_type, _async_handle_frame))
+
+        # Refresh the stream statistics while frames flow, in the event loop
+        @callback
+        def _async_refresh_stats(_now) -> None:
+            self.async_update_listeners()
+
+        self._stream_unsubs.append(async_track_time_interval(
+            self.hass, _async_refresh_stats, timedelta(seconds=STREAM_STATS_WINDOW)
+        ))
+        self._stream = frames
+        try:
+            await self._api.startStream(frames)
+        except Exception:
+            # Do not leave the socket and listeners behind
+            await self.stopStream()
+            raise
+        _LOGGER.info(f"Started frame stream to {self.device_name}")
+
+    async def stopStream(self) -> StreamStats | None:
+        """Stop the frame stream, returns what it achieved."""
+        while self._stream_unsubs:
+            self._stream_unsubs.pop()()
+        frames, self._stream = self._stream, None
+        if frames is None:
+            return None
+        await self._api.cancelAnimation()
+        _LOGGER.info(f"Stopped frame stream to {self.device_name}: {frames.stats.asDict()}")
+        return frames.stats
+
+    @property
+    def stream_stats(self) -> StreamStats | None:
+        """Statistics of the running frame stream."""
+        return self._stream.stats if self._stream else None
     
+    async def async_shutdown(self) -> None:
+        """Stop pending publications."""
+        await self.stopStream()
+        await super().async_shutdown()
+        self._push_debouncer.async_shutdown()
+
     async def reset_connection(self):
         """Reset the connection to the device."""
         await self._api.reset_connection_state()
         _LOGGER.info(f"Reset connection for {self.device_name}")
     
+    @property
+    def metrics(self) -> DeviceMetrics:
+        """Latency and throughput metrics of the device."""
+        return self._api.metrics
+
+    @property
+    def health(self) -> int:
+        """Link health score from 0 to 100."""
+        return self._api.circuit.health
+
+    @property
+    def is_connected(self) -> bool:
+        return self._api.is_connected
+
+    @property
+    def source(self) -> str:
+        """The adapter or proxy the light is currently reached through."""
+        return self._api.source
+
+    @property
+    def queue_depth(self) -> int:
+        """Bursts running or waiting for the light."""
+        return self._api.queue_depth
+
     @property
     def connection_status(self):
         """Get connection status information."""
+        stats = self._api.connection_stats
         return {
             "is_connected": self._api.is_connected,
             "connection_failures": self._api.connection_failures,
             "address": self.device_address,
-            "name": self.device_name
+            "name": self.device_name,
+            "connects": stats.connects,
+            "connection_reuses": stats.reuses,
+            "average_connect_time": round(stats.average_connect_time, 3),
+            "setup_time_saved": round(stats.setup_time_saved, 3),
+            "keep_alives": stats.keep_alives,
+            "idle_disconnects": stats.idle_disconnects,
+            "poll_interval": self.poll_interval,
+            "pending_expectations": self._api.pending_expectations,
+            "queue_depth": self.queue_depth,
+            "startup_time_saved": self.startup_time_saved,
+            "circuit": self._api.circuit.state,
+            "retry_in": round(self._api.circuit.retry_in),
+            "health": self.health,
+            "rssi": self._api.circuit.rssi,
+            "path": self.source,
+            "paths": self._api.paths.asDict()
         }
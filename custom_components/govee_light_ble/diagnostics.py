@@ -0,0 +1,30 @@
+"""Diagnostics support for Govee Bluetooth lights."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_SCHEDULER
+from .coordinator import GoveeCoordinator
+
+TO_REDACT = {CONF_ADDRESS, "address", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: ConfigEntry) -> dict[str, Any]:
+    """Return connection health and latency histograms of a light."""
+    coordinator: GoveeCoordinator = hass.data[DOMAIN][config_entry.entry_id].coordinator
+    scheduler = hass.data[DOMAIN].get(DATA_SCHEDULER)
+    return {
+        "entry": async_redact_data(
+            {"data": dict(config_entry.data), "options": dict(config_entry.options), "unique_id": config_entry.unique_id},
+            TO_REDACT
+        ),
+        "connection": async_redact_data(coordinator.connection_status, TO_REDACT),
+        "metrics": coordinator.metrics.asDict(),
+        "stream": stats.asDict() if (stats := coordinator.stream_stats) else None,
+        "adapters": scheduler.status if scheduler else {},
+    }
@@ -1,17 +1,34 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.components.light import (ColorMode, LightEntity, ATTR_BRIGHTNESS, ATTR_RGB_COLOR, ATTR_EFFECT)
+from homeassistant.components.light import (ColorMode, LightEntity, LightEntityFeature, ATTR_BRIGHTNESS, ATTR_RGB_COLOR, ATTR_EFFECT, ATTR_TRANSITION)
 from homeassistant.const import CONF_ADDRESS, CONF_NAME
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import GoveeAPI
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    SERVICE_SET_SEGMENT_COLORS,
+    SERVICE_START_STREAM,
+    SERVICE_STOP_STREAM,
+    ATTR_COLORS,
+    ATTR_PORT,
+    ATTR_HOST,
+    ATTR_EVENT_TYPE,
+    STREAM_EVENT_TYPE,
+    STREAM_DEFAULT_HOST
+)
 from .coordinator import GoveeCoordinator
 from .api_utils import EFFECT_MAP
+from .breaker import CircuitOpenError
+from .scheduler import SlotTimeoutError
 
 import logging
 _LOGGER = logging.getLogger(__name__)
@@ -30,9 +47,36 @@ async def async_setup_entry(
         config_entry.entry_id
     ].coordinator
 
+    # The coordinator already refreshed or restored its state, no update before add
     async_add_entities([
         GoveeBluetoothLight(coordinator)
-    ], True)
+    ])
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_SEGMENT_COLORS,
+        {
+            vol.Required(ATTR_COLORS): vol.All(cv.ensure_list, [
+                vol.Any(None, vol.All(vol.ExactSequence((cv.byte, cv.byte, cv.byte)), vol.Coerce(tuple)))
+            ])
+        },
+        "async_set_segment_colors",
+    )
+    platform.async_register_entity_service(
+        SERVICE_START_STREAM,
+        {
+            vol.Optional(ATTR_PORT): cv.port,
+            vol.Optional(ATTR_HOST, default=STREAM_DEFAULT_HOST): cv.string,
+            vol.Optional(ATTR_EVENT_TYPE): cv.string
+        },
+        "async_start_stream",
+    )
+    platform.async_register_entity_service(
+        SERVICE_STOP_STREAM,
+        {},
+        "async_stop_stream",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
 
 class GoveeBluetoothLight(CoordinatorEntity, LightEntity):
@@ -46,9 +90,13 @@ class GoveeBluetoothLight(CoordinatorEntity, LightEntity):
         self._attr_name = coordinator.device_name
         self._attr_unique_id = f"{coordinator.device_address}"
         
-        # Set effect list based on device capabilities
-        if coordinator.music_mode_support:
-            self._attr_effect_list = list(EFFECT_MAP.keys())
+        # Set effect list based on device capabilities, host side effects work on every device
+        self._attr_supported_features = LightEntityFeature.TRANSITION
+        effects = list(EFFECT_MAP.keys()) if coordinator.music_mode_support else []
+        effects.extend(coordinator.effects)
+        if effects:
+            self._attr_effect_list = effects
+            self._attr_supported_features |= LightEntityFeature.EFFECT
         else:
             self._attr_effect_list = None
             
@@ -84,17 +132,80 @@ class GoveeBluetoothLight(CoordinatorEntity, LightEntity):
         """Return the current effect."""
         return self.coordinator.data.current_effect
 
+    @property
+    def extra_state_attributes(self):
+        """Return the per segment colors if known."""
+        if not self.coordinator.data.segments:
+            return None
+        return {"segments": [list(color) if color else None for color in self.coordinator.data.segments]}
+
+    async def _async_send(self) -> bool:
+        """Send the buffered changes, unreachable lights fail right away."""
+        try:
+            return await self.coordinator.sendPacketBuffer()
+        except (CircuitOpenError, SlotTimeoutError) as e:
+            raise HomeAssistantError(str(e)) from e
+
+    async def async_set_segment_colors(self, colors):
+        """Paint each segment its own color."""
+        if not self.coordinator.device_segmented:
+            raise HomeAssistantError(f"{self.coordinator.device_name} has no individually controllable segments")
+        await self.coordinator.setSegmentColorsBuffered(colors)
+        if not await self._async_send():
+            _LOGGER.warning(f"{self.coordinator.device_name} did not confirm all segment colors")
+
+    async def async_start_stream(self, port: int | None = None, event_type: str | None = None, host: str = STREAM_DEFAULT_HOST):
+        """Drive the light from a local UDP socket and/or an event."""
+        if port is None and event_type is None:
+            event_type = STREAM_EVENT_TYPE
+        try:
+            await self.coordinator.startStream(self.entity_id, port, event_type, host)
+        except (CircuitOpenError, SlotTimeoutError) as e:
+            raise HomeAssistantError(str(e)) from e
+        except OSError as e:
+            raise HomeAssistantError(f"Cannot listen for stream frames on {host}:{port}: {e}") from e
+
+    async def async_stop_stream(self) -> ServiceResponse:
+        """Stop the stream and report the achieved frame rate and latency."""
+        stats = await self.coordinator.stopStream()
+        return stats.asDict() if stats else {}
+
     async def async_turn_on(self, **kwargs):
         """Turn device on."""
-        await self.coordinator.setStateBuffered(True)
-
+        brightness_mapped = None
         if ATTR_BRIGHTNESS in kwargs:
             brightness = kwargs.get(ATTR_BRIGHTNESS, 255) #1-255
             brightness_mapped = num_to_range(brightness, 1, 255, 0, 255) #mapping from 1-255 to 0-255
+
+        color = kwargs.get(ATTR_RGB_COLOR)
+
+        if kwargs.get(ATTR_EFFECT) in self.coordinator.effects:
+            # Played by the sequencer on the host
+            try:
+                await self.coordinator.startSequence(kwargs[ATTR_EFFECT])
+            except (CircuitOpenError, SlotTimeoutError) as e:
+                raise HomeAssistantError(str(e)) from e
+            return
+
+        if kwargs.get(ATTR_TRANSITION) and brightness_mapped is None and not color and not self.is_on:
+            # Fade in to the brightness the light had before
+            brightness_mapped = self.coordinator.resume_brightness
+
+        if kwargs.get(ATTR_TRANSITION) and (brightness_mapped is not None or color):
+            # Fade in the background, the device is driven frame by frame
+            try:
+                await self.coordinator.startTransition(kwargs[ATTR_TRANSITION], brightness_mapped, color)
+            except (CircuitOpenError, SlotTimeoutError) as e:
+                raise HomeAssistantError(str(e)) from e
+            return
+
+        await self.coordinator.setStateBuffered(True)
+
+        if brightness_mapped is not None:
             await self.coordinator.setBrightnessBuffered(brightness_mapped)
 
-        if ATTR_RGB_COLOR in kwargs:
-            red, green, blue = kwargs.get(ATTR_RGB_COLOR)
+        if color:
+            red, green, blue = color
             await self.coordinator.setColorBuffered(red, green, blue)
 
         if ATTR_EFFECT in kwargs and self.coordinator.music_mode_support:
@@ -104,10 +215,20 @@ class GoveeBluetoothLight(CoordinatorEntity, LightEntity):
             else:
                 _LOGGER.warning(f"Unknown effect: {effect}")
         
-        await self.coordinator.sendPacketBuffer()
+        if not await self._async_send():
+            _LOGGER.warning(f"{self.coordinator.device_name} did not confirm all changes")
 
     
     async def async_turn_off(self, **kwargs):
         """Turn device off."""
+        if kwargs.get(ATTR_TRANSITION) and self.is_on:
+            # Fade to dark in the background, then power off
+            try:
+                await self.coordinator.startFadeOut(kwargs[ATTR_TRANSITION])
+            except (CircuitOpenError, SlotTimeoutError) as e:
+                raise HomeAssistantError(str(e)) from e
+            return
+
         await self.coordinator.setStateBuffered(False)
-        await self.coordinator.sendPacketBuffer()
+        if not await self._async_send():
+            _LOGGER.warning(f"{self.coordinator.device_name} did not confirm turning off")
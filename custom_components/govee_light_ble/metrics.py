@@ -0,0 +1,92 @@
+"""Latency and throughput metrics of a single device."""
+from __future__ import annotations
+
+import bisect
+import math
+
+from .const import METRIC_BUCKETS
+
+
+class Histogram:
+    """Counts observations in fixed buckets, quantiles are estimated from the bucket bounds."""
+
+    def __init__(self, buckets: tuple[float, ...] = METRIC_BUCKETS):
+        self.buckets = buckets
+        #one count per bucket plus one for values above the last bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """ returns the upper bound of the bucket holding the q quantile """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def asDict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.buckets, self.counts)},
+                "inf": self.counts[-1]
+            }
+        }
+
+
+class DeviceMetrics:
+    """Histograms (seconds) and counters collected for one light."""
+
+    def __init__(self):
+        self.connect_time = Histogram()
+        self.write_latency = Histogram()
+        self.ack_round_trip = Histogram()
+        self.poll_duration = Histogram()
+        #time a burst waited behind other bursts of the same light
+        self.queue_wait = Histogram()
+        self.backoff_time = Histogram()
+        self.packets_sent = 0
+        self.packets_acked = 0
+        self.notifications = 0
+
+    @property
+    def ack_ratio(self) -> float | None:
+        """Share of sent packets the device acknowledged."""
+        return self.packets_acked / self.packets_sent if self.packets_sent else None
+
+    def asDict(self) -> dict:
+        return {
+            "connect_time": self.connect_time.asDict(),
+            "write_latency": self.write_latency.asDict(),
+            "ack_round_trip": self.ack_round_trip.asDict(),
+            "poll_duration": self.poll_duration.asDict(),
+            "queue_wait": self.queue_wait.asDict(),
+            "backoff_time": self.backoff_time.asDict(),
+            "packets_sent": self.packets_sent,
+            "packets_acked": self.packets_acked,
+            "ack_ratio": self.ack_ratio,
+            "notifications": self.notifications
+        }
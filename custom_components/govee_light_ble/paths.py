@@ -0,0 +1,84 @@
+"""Choice between the adapters and proxies a light can be reached through."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .const import RSSI_UNUSABLE, RSSI_EXCELLENT, PATH_SWITCH_MARGIN
+
+
+@dataclass(frozen=True, slots=True)
+class PathCandidate:
+    ble_device: object
+    source: str
+    rssi: int | None = None
+    #connections the adapter or proxy can still open, None if unknown
+    free_slots: int | None = None
+
+
+@dataclass
+class PathStats:
+    """Connection outcomes through one adapter or proxy."""
+
+    attempts: int = 0
+    successes: int = 0
+    #smoothed seconds to connect
+    connect_time: float | None = None
+
+    @property
+    def success_rate(self) -> float:
+        #an unknown path starts at an even chance
+        return (self.successes + 1) / (self.attempts + 2)
+
+
+class PathSelector:
+    """Scores paths by signal, past connection success and free slots."""
+
+    def __init__(self):
+        self.stats: dict[str, PathStats] = {}
+
+    def record(self, source: str, success: bool, connect_time: float | None = None):
+        stats = self.stats.setdefault(source, PathStats())
+        stats.attempts += 1
+        if success:
+            stats.successes += 1
+        if connect_time is not None:
+            #exponentially weighted moving average, the first connect seeds it
+            stats.connect_time = connect_time if stats.connect_time is None else stats.connect_time * 0.8 + connect_time * 0.2
+
+    def score(self, candidate: PathCandidate) -> float:
+        """ returns a score, higher is better """
+        if candidate.rssi is None:
+            signal = 0.5
+        else:
+            signal = min(max((candidate.rssi - RSSI_UNUSABLE) / (RSSI_EXCELLENT - RSSI_UNUSABLE), 0.0), 1.0)
+        stats = self.stats.get(candidate.source, PathStats())
+        #a path that keeps failing is poor however strong its signal
+        score = stats.success_rate * (0.5 + signal * 0.5)
+        if stats.connect_time is not None:
+            #slow links cost up to a fifth
+            score -= min(stats.connect_time / 10, 0.2)
+        if candidate.free_slots == 0:
+            #usable only if every other path is full as well
+            score -= 1
+        return score
+
+    def choose(self, candidates: list[PathCandidate], current: str | None = None) -> PathCandidate | None:
+        """ returns the best candidate, staying on the current path unless another is clearly better """
+        if not candidates:
+            return None
+        scored = sorted(((self.score(candidate), candidate) for candidate in candidates), key=lambda item: item[0], reverse=True)
+        best_score, best = scored[0]
+        for score, candidate in scored:
+            if candidate.source == current and score + PATH_SWITCH_MARGIN >= best_score:
+                return candidate
+        return best
+
+    def asDict(self) -> dict:
+        return {
+            source: {
+                "attempts": stats.attempts,
+                "successes": stats.successes,
+                "connect_time": round(stats.connect_time, 3) if stats.connect_time is not None else None
+            }
+            for source, stats in self.stats.items()
+        }
@@ -0,0 +1,163 @@
+"""Integration-wide scheduling of BLE connection slots."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+
+from .const import MAX_CONNECTIONS_PER_ADAPTER, SLOT_WAIT_TIMEOUT
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+#lower value runs first
+PRIORITY_USER = 0
+PRIORITY_POLL = 1
+
+DEFAULT_SOURCE = "default"
+
+
+class SlotTimeoutError(ConnectionError):
+    """Raised when no connection slot of an adapter or proxy became free in time."""
+
+    def __init__(self, source: str, timeout: float):
+        super().__init__(f"No connection slot on {source} became free within {timeout:.0f}s, other lights hold all of them")
+        self.source = source
+        self.timeout = timeout
+
+
+class PriorityGate:
+    """Admits a limited number of holders, by priority and first come first served."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers queued for the gate."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, priority: int = PRIORITY_USER):
+        """Waits until the caller may proceed."""
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                #the slot was already handed to us, pass it on
+                self.release()
+            raise
+
+    def release(self):
+        """Frees the slot and wakes the next waiter in line."""
+        self.active -= 1
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+                return
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_USER):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class GoveeConnectionScheduler:
+    """Limits concurrent connections per adapter or proxy across all lights.
+
+    A slot is held for the whole life of a connection, including the time an
+    open link sits idle. Idle links are asked to disconnect when another
+    light needs their slot.
+    """
+
+    def __init__(self, limit_per_source: int = MAX_CONNECTIONS_PER_ADAPTER):
+        self._limit_per_source = limit_per_source
+        self._gates: dict[str, PriorityGate] = {}
+        #idle connections per source that give their slot back on request, oldest first
+        self._idle: dict[str, dict[object, Callable[[], None]]] = {}
+
+    @staticmethod
+    def source_of(ble_device) -> str:
+        """Returns the adapter or proxy a device is reached through."""
+        details = getattr(ble_device, "details", None)
+        if isinstance(details, dict) and details.get("source"):
+            return details["source"]
+        return DEFAULT_SOURCE
+
+    def gate(self, source: str) -> PriorityGate:
+        """Returns the gate guarding the slots of one adapter or proxy."""
+        if source not in self._gates:
+            self._gates[source] = PriorityGate(self._limit_per_source)
+        return self._gates[source]
+
+    def free_slots(self, source: str) -> int:
+        """Connections the integration may still open through a source, open idle links count as used."""
+        gate = self._gates.get(source)
+        return self._limit_per_source if gate is None else max(gate.limit - gate.active, 0)
+
+    async def acquire(self, source: str, priority: int = PRIORITY_USER, timeout: float = SLOT_WAIT_TIMEOUT):
+        """Waits for a connection slot of the given source, release() gives it back.
+
+        Links that are kept open or busy streaming never offer their slot, so
+        the wait is bounded and raises SlotTimeoutError instead of blocking
+        the light behind them.
+        """
+        gate = self.gate(source)
+        if gate.active >= gate.limit:
+            #make room by closing the longest idle connection
+            self._evict(source)
+        try:
+            async with asyncio.timeout(timeout):
+                await gate.acquire(priority)
+        except TimeoutError as e:
+            _LOGGER.warning(f"No connection slot on {source} became free within {timeout}s: {self.status.get(source)}")
+            raise SlotTimeoutError(source, timeout) from e
+
+    def release(self, source: str):
+        self.gate(source).release()
+
+    def mark_idle(self, source: str, holder: object, evict: Callable[[], None]):
+        """Offers the slot of an idle connection, evict is called when another light needs it."""
+        idle = self._idle.setdefault(source, {})
+        idle.pop(holder, None)
+        idle[holder] = evict
+
+    def mark_busy(self, source: str, holder: object):
+        """Withdraws the offer made by mark_idle."""
+        self._idle.get(source, {}).pop(holder, None)
+
+    def _evict(self, source: str):
+        idle = self._idle.get(source)
+        if not idle:
+            return
+        holder = next(iter(idle))
+        evict = idle.pop(holder)
+        _LOGGER.debug(f"Asking an idle connection on {source} to give its slot back")
+        evict()
+
+    @property
+    def status(self) -> dict[str, dict[str, int]]:
+        """Current usage of every known adapter or proxy."""
+        return {
+            source: {
+                "active": gate.active,
+                "idle": len(self._idle.get(source, {})),
+                "waiting": gate.waiting,
+                "limit": gate.limit
+            }
+            for source, gate in self._gates.items()
+        }
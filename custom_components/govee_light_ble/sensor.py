@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import GoveeCoordinator
+from .metrics import Histogram
+
+@dataclass(frozen=True, kw_only=True)
+class GoveeSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor of a Govee light."""
+
+    value_fn: Callable[[GoveeCoordinator], Any]
+
+def _milliseconds(histogram: Histogram, q: float) -> float | None:
+    """Quantile of a histogram in milliseconds."""
+    value = histogram.quantile(q)
+    return round(value * 1000, 1) if value is not None else None
+
+# Only the link health and poll interval are enabled by default, every sensor
+# is written on each coordinator update, the full histograms are in diagnostics
+SENSORS: tuple[GoveeSensorEntityDescription, ...] = (
+    GoveeSensorEntityDescription(
+        key="poll_interval",
+        name="Poll interval",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.poll_interval,
+    ),
+    GoveeSensorEntityDescription(
+        key="stream_fps",
+        name="Stream frame rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="fps",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: round(stats.fps, 1) if (stats := coordinator.stream_stats) else None,
+    ),
+    GoveeSensorEntityDescription(
+        key="stream_latency",
+        name="Stream latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: round(stats.latency * 1000, 1) if (stats := coordinator.stream_stats) else None,
+    ),
+    GoveeSensorEntityDescription(
+        key="health",
+        name="Link health",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.health,
+    ),
+    GoveeSensorEntityDescription(
+        key="connect_time",
+        name="Connect time",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.metrics.connect_time, 0.5),
+    ),
+    GoveeSensorEntityDescription(
+        key="write_latency",
+        name="Write latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.metrics.write_latency, 0.5),
+    ),
+    GoveeSensorEntityDescription(
+        key="ack_round_trip",
+        name="Command round trip",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.metrics.ack_round_trip, 0.95),
+    ),
+    GoveeSensorEntityDescription(
+        key="poll_duration",
+        name="Poll duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.metrics.poll_duration, 0.5),
+    ),
+    GoveeSensorEntityDescription(
+        key="queue_wait",
+        name="Command queue wait",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.metrics.queue_wait, 0.95),
+    ),
+    GoveeSensorEntityDescription(
+        key="queue_depth",
+        name="Command queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.queue_depth,
+    ),
+    GoveeSensorEntityDescription(
+        key="ack_ratio",
+        name="Acknowledged packets",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: round(ratio * 100, 1) if (ratio := coordinator.metrics.ack_ratio) is not None else None,
+    ),
+    GoveeSensorEntityDescription(
+        key="notifications",
+        name="Notifications received",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.metrics.notifications,
+    ),
+)
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+):
+    """Set up the diagnostic sensors."""
+    coordinator: GoveeCoordinator = hass.data[DOMAIN][
+        config_entry.entry_id
+    ].coordinator
+
+    async_add_entities(
+        GoveeDiagnosticSensor(coordinator, description) for description in SENSORS
+    )
+
+
+class GoveeDiagnosticSensor(CoordinatorEntity, SensorEntity):
+
+    entity_description: GoveeSensorEntityDescription
+
+    def __init__(self, coordinator: GoveeCoordinator, description: GoveeSensorEntityDescription):
+        """Initialize."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = f"{coordinator.device_name} {description.name}"
+        self._attr_unique_id = f"{coordinator.device_address}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.device_address)}
+        )
+
+    @property
+    def native_value(self):
+        """Return the current value."""
+        return self.entity_description.value_fn(self.coordinator)
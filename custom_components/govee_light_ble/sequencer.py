@@ -0,0 +1,106 @@
+"""Host side effects compiled into frame schedules ahead of playback."""
+from __future__ import annotations
+
+import bisect
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .api_utils import GoveeUtils, LedPacket
+
+#maps linear progress 0-1 to eased progress 0-1
+EASINGS: dict[str, Callable[[float], float]] = {
+    "linear": lambda p: p,
+    "ease_in": lambda p: p * p,
+    "ease_out": lambda p: 1 - (1 - p) * (1 - p),
+    "ease_in_out": lambda p: (1 - math.cos(math.pi * p)) / 2,
+    "step": lambda p: 1.0 if p >= 1 else 0.0,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Keyframe:
+    time: float
+    brightness: float | None = None
+    color: tuple[int, int, int] | None = None
+    #easing of the segment leading into this keyframe
+    easing: str = "linear"
+
+
+@dataclass(frozen=True)
+class EffectDefinition:
+    """A user defined effect, keyframes sorted by time."""
+
+    name: str
+    keyframes: tuple[Keyframe, ...]
+    loop: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.keyframes[-1].time
+
+    def _track(self, field: str) -> list[tuple[float, object, str]]:
+        """ returns the keyframes defining one field """
+        return [(k.time, getattr(k, field), k.easing) for k in self.keyframes if getattr(k, field) is not None]
+
+    def sample(self, offset: float) -> tuple[float | None, tuple[int, int, int] | None]:
+        """ returns brightness and color at offset seconds """
+        brightness = _interpolate(self._track("brightness"), offset, lambda a, b, p: a + (b - a) * p)
+        color = _interpolate(
+            self._track("color"), offset,
+            lambda a, b, p: tuple(round(x + (y - x) * p) for x, y in zip(a, b))
+        )
+        return brightness, color
+
+
+def _interpolate(track, offset, mix):
+    """ eases between the keyframes of a track surrounding offset """
+    if not track:
+        return None
+    times = [time for time, _, _ in track]
+    index = bisect.bisect_right(times, offset)
+    if index == 0:
+        return track[0][1]
+    if index == len(track):
+        return track[-1][1]
+    (start, a, _), (end, b, easing) = track[index - 1], track[index]
+    return mix(a, b, EASINGS[easing]((offset - start) / (end - start)))
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledFrame:
+    offset: float
+    brightness: float | None
+    color: tuple[int, int, int] | None
+    #encoded frames written at offset
+    frames: tuple[bytes, ...]
+
+
+@dataclass(frozen=True)
+class CompiledEffect:
+    """Encoded frames of an effect, ready to be written without further work."""
+
+    name: str
+    loop: bool
+    duration: float
+    schedule: tuple[ScheduledFrame, ...]
+
+
+def compileEffect(
+    effect: EffectDefinition,
+    interval: float,
+    packets: Callable[[float | None, tuple[int, int, int] | None], list[LedPacket]]
+) -> CompiledEffect:
+    """ samples the effect every interval seconds and encodes the packets of every sample """
+    steps = max(1, math.ceil(effect.duration / interval))
+    schedule = []
+    last_frames = None
+    for step in range(steps + 1):
+        offset = min(step * interval, effect.duration)
+        brightness, color = effect.sample(offset)
+        frames = tuple(GoveeUtils.generateFrame(packet) for packet in packets(brightness, color))
+        #samples that quantize to the previous frames are not written again
+        if frames != last_frames:
+            last_frames = frames
+            schedule.append(ScheduledFrame(offset, brightness, color, frames))
+    return CompiledEffect(effect.name, effect.loop and effect.duration > 0, effect.duration, tuple(schedule))
@@ -0,0 +1,326 @@
+"""Integration level services acting on several lights at once."""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict
+
+import voluptuous as vol
+
+from homeassistant.components.light import ATTR_BRIGHTNESS, ATTR_RGB_COLOR
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .api_utils import GoveeApiData
+from .const import (
+    DOMAIN,
+    DATA_SCENES,
+    DATA_SCHEDULER,
+    SERVICE_SET_GROUP,
+    SERVICE_SNAPSHOT_SCENE,
+    SERVICE_RESTORE_SCENE,
+    SERVICE_BULK_APPLY,
+    ATTR_STATE,
+    ATTR_SCENE_ID,
+    ATTR_TARGETS,
+    ATTR_MAX_CONCURRENCY,
+    MAX_CONNECTIONS_PER_ADAPTER,
+    BULK_CONCURRENCY
+)
+from .coordinator import GoveeCoordinator
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+SET_GROUP_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+    vol.Optional(ATTR_STATE): cv.boolean,
+    vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    vol.Optional(ATTR_RGB_COLOR): vol.All(vol.ExactSequence((cv.byte, cv.byte, cv.byte)), vol.Coerce(tuple)),
+})
+
+SNAPSHOT_SCENE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_SCENE_ID): cv.string,
+    vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+})
+
+RESTORE_SCENE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_SCENE_ID): cv.string,
+    vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+})
+
+BULK_VALUES = {
+    vol.Optional(ATTR_STATE): cv.boolean,
+    vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    vol.Optional(ATTR_RGB_COLOR): vol.All(vol.ExactSequence((cv.byte, cv.byte, cv.byte)), vol.Coerce(tuple)),
+}
+
+BULK_APPLY_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENTITY_ID, default=[]): cv.entity_ids,
+    **BULK_VALUES,
+    vol.Optional(ATTR_TARGETS, default=[]): vol.All(cv.ensure_list, [vol.Schema({
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        **BULK_VALUES,
+    })]),
+    vol.Optional(ATTR_MAX_CONCURRENCY, default=BULK_CONCURRENCY): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+})
+
+
+def async_get_coordinators(hass: HomeAssistant, entity_ids: list[str]) -> dict[str, GoveeCoordinator]:
+    """Resolve light entities of this integration to their coordinators."""
+    registry = er.async_get(hass)
+    coordinators = {}
+    for entity_id in entity_ids:
+        entry = registry.async_get(entity_id)
+        runtime_data = hass.data.get(DOMAIN, {}).get(entry.config_entry_id) if entry else None
+        if runtime_data is None:
+            raise HomeAssistantError(f"{entity_id} is not a Govee Bluetooth light")
+        coordinators[entity_id] = runtime_data.coordinator
+    return coordinators
+
+
+async def async_prepare_values(coordinator: GoveeCoordinator, state: bool | None, brightness: int | None, color: tuple[int, int, int] | None):
+    """Queue the frames for the requested values, unchanged values add nothing."""
+    if state is False:
+        await coordinator.setStateBuffered(False)
+        return
+    if state or brightness is not None or color:
+        await coordinator.setStateBuffered(True)
+    if brightness is not None:
+        await coordinator.setBrightnessBuffered(brightness)
+    if color:
+        await coordinator.setColorBuffered(*color)
+
+
+async def _async_set_group(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Apply the same values to many lights and release them together."""
+    coordinators = async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+
+    # Build every member's frames before any radio traffic
+    for coordinator in coordinators.values():
+        await async_prepare_values(
+            coordinator,
+            call.data.get(ATTR_STATE),
+            call.data.get(ATTR_BRIGHTNESS),
+            call.data.get(ATTR_RGB_COLOR)
+        )
+
+    # Connect members in parallel so the release does not wait for setup, but
+    # only as many per adapter as it has free slots, the rest connect when flushed
+    scheduler = hass.data[DOMAIN].get(DATA_SCHEDULER)
+    free_slots: dict[str, int] = {}
+    to_prime = {}
+    for entity_id, coordinator in coordinators.items():
+        if coordinator.is_connected:
+            continue
+        source = coordinator.source
+        if scheduler is not None:
+            free_slots.setdefault(source, scheduler.free_slots(source))
+            if free_slots[source] <= 0:
+                continue
+            free_slots[source] -= 1
+        to_prime[entity_id] = coordinator
+    primed = await asyncio.gather(
+        *(coordinator.prime() for coordinator in to_prime.values()),
+        return_exceptions=True
+    )
+    for entity_id, result in zip(to_prime, primed):
+        if isinstance(result, Exception):
+            _LOGGER.warning(f"Could not connect {entity_id} ahead of group update: {result}")
+
+    release = asyncio.Event()
+
+    async def _async_flush(coordinator: GoveeCoordinator):
+        await release.wait()
+        started = time.monotonic()
+        try:
+            success = await coordinator.sendPacketBuffer()
+        except Exception as e:
+            _LOGGER.warning(f"Group update of {coordinator.device_name} failed: {e}")
+            success = False
+        return success, time.monotonic() - started
+
+    tasks = [asyncio.create_task(_async_flush(coordinator)) for coordinator in coordinators.values()]
+    # Let every flush reach the barrier, then release them at once
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    latencies = [latency for _, latency in results]
+    return {
+        "members": {
+            entity_id: {"success": success, "latency": round(latency, 3)}
+            for entity_id, (success, latency) in zip(coordinators, results)
+        },
+        "spread": round(max(latencies) - min(latencies), 3) if latencies else 0.0,
+    }
+
+
+async def _async_snapshot_scene(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Capture the full state of lights under a scene id."""
+    coordinators = async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+    snapshots = await asyncio.gather(*(coordinator.async_snapshot() for coordinator in coordinators.values()))
+    scene = dict(zip(coordinators, snapshots))
+    hass.data[DOMAIN].setdefault(DATA_SCENES, {})[call.data[ATTR_SCENE_ID]] = scene
+    return {"members": {entity_id: asdict(data) for entity_id, data in scene.items()}}
+
+
+async def _async_restore_scene(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Bring lights back to a captured scene, all members concurrently."""
+    scene = hass.data[DOMAIN].get(DATA_SCENES, {}).get(call.data[ATTR_SCENE_ID])
+    if scene is None:
+        raise HomeAssistantError(f"No snapshot named {call.data[ATTR_SCENE_ID]}")
+    entity_ids = call.data.get(ATTR_ENTITY_ID) or list(scene)
+    missing = [entity_id for entity_id in entity_ids if entity_id not in scene]
+    if missing:
+        raise HomeAssistantError(f"{', '.join(missing)} not captured in {call.data[ATTR_SCENE_ID]}")
+    coordinators = async_get_coordinators(hass, entity_ids)
+
+    async def _async_restore(entity_id: str, coordinator: GoveeCoordinator):
+        started = time.monotonic()
+        try:
+            success = await coordinator.async_restore(scene[entity_id])
+        except Exception as e:
+            _LOGGER.warning(f"Restoring {coordinator.device_name} failed: {e}")
+            success = False
+        return success, time.monotonic() - started
+
+    # The connection scheduler spreads the bursts over the available slots
+    results = await asyncio.gather(*(
+        _async_restore(entity_id, coordinator) for entity_id, coordinator in coordinators.items()
+    ))
+    return {
+        "members": {
+            entity_id: {"success": success, "latency": round(latency, 3)}
+            for entity_id, (success, latency) in zip(coordinators, results)
+        }
+    }
+
+
+def _bulk_values(data: dict) -> dict:
+    """The values of a bulk_apply target that were given."""
+    return {key: data[key] for key in (ATTR_STATE, ATTR_BRIGHTNESS, ATTR_RGB_COLOR) if key in data}
+
+
+def _bulk_target(values: dict) -> GoveeApiData:
+    """The state a light should end up in, None fields are left as they are."""
+    state = values.get(ATTR_STATE)
+    if state is None and (ATTR_BRIGHTNESS in values or ATTR_RGB_COLOR in values):
+        # Setting a value turns the light on, like light.turn_on
+        state = True
+    return GoveeApiData(
+        state=state,
+        brightness=values.get(ATTR_BRIGHTNESS),
+        color=values.get(ATTR_RGB_COLOR)
+    )
+
+
+async def _async_bulk_apply(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Bring many lights to their values, spread over the adapters with bounded concurrency."""
+    values: dict[str, dict] = {entity_id: _bulk_values(call.data) for entity_id in call.data[ATTR_ENTITY_ID]}
+    # Later targets override the values given for the same light before
+    for target in call.data[ATTR_TARGETS]:
+        for entity_id in target[ATTR_ENTITY_ID]:
+            values.setdefault(entity_id, {}).update(_bulk_values(target))
+    if not values:
+        raise HomeAssistantError("No lights given")
+    coordinators = async_get_coordinators(hass, list(values))
+
+    # One queue per adapter or proxy, so lights behind a busy one do not hold up the others
+    queues: dict[str, list[str]] = {}
+    for entity_id, coordinator in coordinators.items():
+        queues.setdefault(coordinator.source, []).append(entity_id)
+    limit = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+    results: dict[str, dict] = {}
+    started = time.monotonic()
+
+    async def _async_apply(entity_id: str):
+        coordinator = coordinators[entity_id]
+        target = _bulk_target(values[entity_id])
+        result = {"success": True, "frames": 0, "latency": 0.0}
+        results[entity_id] = result
+        # Lights already showing the values cost no radio time
+        if not coordinator.restore_frames(target):
+            result["finished"] = round(time.monotonic() - started, 3)
+            return
+        async with limit:
+            begun = time.monotonic()
+            result["frames"] = coordinator.restore_frames(target)
+            try:
+                result["success"] = await coordinator.async_restore(target)
+            except Exception as e:
+                _LOGGER.warning(f"Bulk update of {coordinator.device_name} failed: {e}")
+                result["success"] = False
+                result["error"] = str(e)
+            result["latency"] = round(time.monotonic() - begun, 3)
+        result["finished"] = round(time.monotonic() - started, 3)
+
+    async def _async_worker(entity_ids: list[str]):
+        while entity_ids:
+            await _async_apply(entity_ids.pop(0))
+
+    # As many workers per adapter as it has connection slots
+    await asyncio.gather(*(
+        _async_worker(entity_ids)
+        for entity_ids in queues.values()
+        for _ in range(min(MAX_CONNECTIONS_PER_ADAPTER, len(entity_ids)))
+    ))
+
+    members = {entity_id: results[entity_id] for entity_id in coordinators}
+    return {
+        "members": members,
+        "changed": sum(1 for result in members.values() if result["frames"] and result["success"]),
+        "unchanged": sum(1 for result in members.values() if not result["frames"]),
+        "failed": sum(1 for result in members.values() if not result["success"]),
+        "duration": round(time.monotonic() - started, 3),
+    }
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def _async_handle_set_group(call: ServiceCall) -> ServiceResponse:
+        return await _async_set_group(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_GROUP,
+        _async_handle_set_group,
+        schema=SET_GROUP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_handle_snapshot_scene(call: ServiceCall) -> ServiceResponse:
+        return await _async_snapshot_scene(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT_SCENE,
+        _async_handle_snapshot_scene,
+        schema=SNAPSHOT_SCENE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_handle_restore_scene(call: ServiceCall) -> ServiceResponse:
+        return await _async_restore_scene(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE_SCENE,
+        _async_handle_restore_scene,
+        schema=RESTORE_SCENE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_handle_bulk_apply(call: ServiceCall) -> ServiceResponse:
+        return await _async_bulk_apply(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_APPLY,
+        _async_handle_bulk_apply,
+        schema=BULK_APPLY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
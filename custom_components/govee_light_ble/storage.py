@@ -0,0 +1,60 @@
+"""Persists the last known state of every light across restarts."""
+from __future__ import annotations
+
+from dataclasses import asdict
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api_utils import GoveeApiData
+from .const import DOMAIN, STORAGE_VERSION, STORAGE_SAVE_DELAY
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+
+class GoveeStateStore:
+    """Last published state per device address, written with a delay."""
+
+    def __init__(self, hass: HomeAssistant):
+        self._store: Store[dict[str, dict]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.state")
+        self._states: dict[str, dict] = {}
+
+    async def async_load(self):
+        self._states = await self._store.async_load() or {}
+
+    def get(self, address: str) -> GoveeApiData | None:
+        """Returns the persisted state of a device, if any."""
+        stored = self._states.get(address)
+        if not stored:
+            return None
+        try:
+            color = stored.get("color")
+            segments = stored.get("segments")
+            return GoveeApiData(
+                state=stored.get("state"),
+                brightness=stored.get("brightness"),
+                color=tuple(color) if color else None,
+                current_effect=stored.get("current_effect"),
+                music_mode_enabled=stored.get("music_mode_enabled", False),
+                segments=tuple(tuple(segment) if segment else None for segment in segments) if segments else None
+            )
+        except (TypeError, ValueError) as e:
+            _LOGGER.debug(f"Ignoring unreadable stored state of {address}: {e}")
+            return None
+
+    @callback
+    def async_update(self, address: str, data: GoveeApiData | None):
+        """Remembers the state of a device and schedules a write."""
+        if data is None:
+            return
+        stored = asdict(data)
+        if self._states.get(address) == stored:
+            return
+        self._states[address] = stored
+        self._store.async_delay_save(lambda: self._states, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, address: str):
+        if self._states.pop(address, None) is not None:
+            self._store.async_delay_save(lambda: self._states, STORAGE_SAVE_DELAY)
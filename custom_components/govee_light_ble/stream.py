@@ -0,0 +1,118 @@
+"""Host driven frame streams, e.g. music sync from a local audio analyser."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from .const import STREAM_BUFFER_SIZE, STREAM_MAX_FRAME_AGE, STREAM_STATS_WINDOW
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class StreamFrame:
+    brightness: float | None
+    color: tuple[int, int, int] | None
+    #monotonic time the frame reached the host
+    received: float
+
+
+@dataclass
+class StreamStats:
+    """Throughput and latency achieved by a frame stream."""
+
+    received: int = 0
+    sent: int = 0
+    dropped: int = 0
+    fps: float = 0.0
+    #seconds from reception to the completed write, smoothed
+    latency: float = 0.0
+    _window_start: float = 0.0
+    _window_sent: int = 0
+
+    def recordSent(self, received: float):
+        """ accounts one frame written to the device """
+        now = time.monotonic()
+        self.sent += 1
+        latency = now - received
+        #exponentially weighted moving average, the first frame seeds it
+        self.latency = latency if self.sent == 1 else self.latency * 0.8 + latency * 0.2
+        if not self._window_start:
+            self._window_start = now
+        self._window_sent += 1
+        elapsed = now - self._window_start
+        if elapsed >= STREAM_STATS_WINDOW:
+            self.fps = self._window_sent / elapsed
+            self._window_start, self._window_sent = now, 0
+
+    def asDict(self) -> dict:
+        return {
+            "received": self.received,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "fps": round(self.fps, 1),
+            "latency_ms": round(self.latency * 1000, 1)
+        }
+
+
+class FrameRingBuffer:
+    """Keeps only the newest frames, the consumer always gets the latest state."""
+
+    def __init__(self, size: int = STREAM_BUFFER_SIZE):
+        self._frames: deque[StreamFrame] = deque(maxlen=size)
+        self._available = asyncio.Event()
+        self.stats = StreamStats()
+
+    def push(self, brightness: float | None = None, color: tuple[int, int, int] | None = None):
+        """ adds a frame, overwriting the oldest one when full """
+        if brightness is None and color is None:
+            return
+        if len(self._frames) == self._frames.maxlen:
+            self.stats.dropped += 1
+        self._frames.append(StreamFrame(brightness, color, time.monotonic()))
+        self.stats.received += 1
+        self._available.set()
+
+    async def next(self) -> StreamFrame:
+        """ waits for frames and merges everything buffered into the newest one """
+        while True:
+            await self._available.wait()
+            self._available.clear()
+            frames, self._frames = self._frames, deque(maxlen=self._frames.maxlen)
+            newest = frames.pop()
+            if time.monotonic() - newest.received > STREAM_MAX_FRAME_AGE:
+                self.stats.dropped += len(frames) + 1
+                continue
+            #fields only carried by skipped frames are still applied
+            brightness, color = newest.brightness, newest.color
+            for frame in reversed(frames):
+                brightness = frame.brightness if brightness is None else brightness
+                color = frame.color if color is None else color
+            self.stats.dropped += len(frames)
+            return StreamFrame(brightness, color, newest.received)
+
+
+def parseDatagram(data: bytes) -> tuple[float | None, tuple[int, int, int] | None] | None:
+    """ decodes a red, green, blue[, brightness] datagram """
+    if len(data) == 3:
+        return None, (data[0], data[1], data[2])
+    if len(data) == 4:
+        return data[3], (data[0], data[1], data[2])
+    return None
+
+
+class UdpFrameProtocol(asyncio.DatagramProtocol):
+    """Feeds frames received on a local UDP socket into a ring buffer."""
+
+    def __init__(self, frames: FrameRingBuffer):
+        self._frames = frames
+
+    def datagram_received(self, data: bytes, addr):
+        frame = parseDatagram(data)
+        if frame is None:
+            _LOGGER.debug(f"Ignoring malformed stream datagram of {len(data)} bytes from {addr}")
+            return
+        self._frames.push(*frame)